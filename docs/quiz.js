@@ -12,15 +12,58 @@ function setupQuizControls() {
   document.getElementById("startButton").addEventListener("click", startQuiz);
 }
 
+// Question lists per "lang/level", kept for the lifetime of the page so replays need no network
+const questionCache = {};
+let shardIndexPromise = null;
+
+function loadShardIndex() {
+    // Index of the per-level shards written by tools/quiz-shards.py
+    if (!shardIndexPromise) {
+        shardIndexPromise = fetch("lang/shards/index.json")
+            .then(res => res.ok ? res.json() : null)
+            .catch(() => null);
+    }
+    return shardIndexPromise;
+}
+
+async function fetchLevelQuestions(lang, level) {
+    const index = await loadShardIndex();
+    const shard = index && index.languages[lang] && index.languages[lang][level];
+    if (shard) {
+        const res = await fetch(`lang/shards/${shard.file}`);
+        if (res.ok) {
+            return res.json();
+        }
+    }
+
+    // Fallback: full language file, filtered here
+    const res = await fetch(`lang/${lang}.json`);
+    const data = await res.json();
+    return data.filter(q => q.difficulty.includes(level));
+}
+
+function getLevelQuestions(lang, level) {
+    const key = `${lang}/${level}`;
+    if (!questionCache[key]) {
+        questionCache[key] = fetchLevelQuestions(lang, level).catch(error => {
+            delete questionCache[key];
+            throw error;
+        });
+    }
+    return questionCache[key];
+}
+
 async function loadQuestions() { 
     try {
-        const res = await fetch(`lang/${selectedLang}.json`);
-        const data = await res.json();
-        
-        const filtered = data.filter(q => q.difficulty.includes(selectedLevel));
+        const filtered = await getLevelQuestions(selectedLang, selectedLevel);
+        if (filtered.length === 0) {
+            return [];
+        }
+
+        // Shuffle copies so the cached list stays untouched
         let extended = [...filtered];
         while (extended.length < maxQuestionsPerQuiz) {
-            extended.push(...shuffle(filtered));
+            extended.push(...shuffle([...filtered]));
         }
         return shuffle(extended).slice(0, maxQuestionsPerQuiz);
     } catch (error) {
@@ -57,9 +100,20 @@ async function startQuiz() {
     showQuestion();
 }
 
+// Shown when a level has no questions (empty shard or failed download)
+const noQuestionsText = {
+    de: "Für diese Sprache und dieses Level gibt es noch keine Fragen.",
+    en: "There are no questions for this language and level yet.",
+    fr: "Il n'y a pas encore de questions pour cette langue et ce niveau."
+};
+
 function showQuestion() {
-    const q = questions[currentQuestion];
     const container = document.getElementById("quiz");
+    if (questions.length === 0) {
+        container.innerHTML = `<p>${noQuestionsText[selectedLang] || noQuestionsText.en}</p>`;
+        return;
+    }
+    const q = questions[currentQuestion];
     container.innerHTML = `<p><b>${currentQuestion + 1}/${maxQuestionsPerQuiz}:</b> ${q.question}</p>` +
         q.options.map((opt, i) =>
             `<button onclick="checkAnswer(${i})">${opt}</button>`
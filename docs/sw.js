@@ -0,0 +1,88 @@
+// Service Worker: caches the app shell and the question shards so replays are
+// instant and the quiz keeps working offline.
+const CACHE_NAME = "bitcointrivia-v2";
+const SHARD_INDEX = "lang/shards/index.json";
+
+const APP_SHELL = [
+    "./",
+    "index.html",
+    "quiz.js",
+    "css/style.css",
+    "favicon.ico",
+    "assets/images/BitcoinTriviaV3.png",
+    "assets/images/IntroV03.png",
+    SHARD_INDEX
+];
+// The result images are not precached: only one of them is shown per quiz,
+// and the fetch handler caches it when it is first loaded.
+
+self.addEventListener("install", (event) => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        await cache.addAll(APP_SHELL);
+
+        // Precache every shard listed in the index so all levels work offline
+        try {
+            const index = await (await cache.match(SHARD_INDEX)).json();
+            const files = [];
+            for (const levels of Object.values(index.languages)) {
+                for (const shard of Object.values(levels)) {
+                    files.push(`lang/shards/${shard.file}`);
+                }
+            }
+            await cache.addAll(files);
+        } catch (error) {
+            console.warn("Shards konnten nicht vorab geladen werden:", error);
+        }
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener("activate", (event) => {
+    event.waitUntil((async () => {
+        const names = await caches.keys();
+        await Promise.all(names.filter(name => name !== CACHE_NAME).map(name => caches.delete(name)));
+        await self.clients.claim();
+    })());
+});
+
+function isShardFile(url) {
+    // Shard names contain a content hash, so a cached copy never goes stale
+    return url.pathname.includes("/lang/shards/") && !url.pathname.endsWith("/index.json");
+}
+
+async function cacheFirst(request) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(request);
+    if (cached) {
+        return cached;
+    }
+    const res = await fetch(request);
+    if (res.ok) {
+        cache.put(request, res.clone());
+    }
+    return res;
+}
+
+async function staleWhileRevalidate(event) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(event.request);
+    const network = fetch(event.request)
+        .then(res => {
+            if (res.ok) {
+                cache.put(event.request, res.clone());
+            }
+            return res;
+        })
+        .catch(() => cached);
+    event.waitUntil(network);
+    return cached || network;
+}
+
+self.addEventListener("fetch", (event) => {
+    const url = new URL(event.request.url);
+    if (event.request.method !== "GET" || url.origin !== self.location.origin) {
+        return;
+    }
+    event.respondWith(isShardFile(url) ? cacheFirst(event.request) : staleWhileRevalidate(event));
+});
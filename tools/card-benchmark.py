@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+
+"""
+Bitcoin Trivia Card Generator Benchmark
+Measures generator throughput on synthetic question banks and compares runs against a saved baseline.
+"""
+
+import json
+import os
+import sys
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+import contextlib
+import io
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATOR_PATH = os.path.join(TOOLS_DIR, "card-generator.py")
+
+sys.path.insert(0, TOOLS_DIR)
+
+# Bank sizes generated by default
+DEFAULT_SIZES = [10, 1000, 10000, 100000]
+
+# Metrics compared against a baseline, and whether higher values are better
+COMPARED_METRICS = {
+    "cards_per_sec": True,
+    "total_sec": False,
+    "peak_rss_mb": False,
+    "pdf_bytes": False,
+    "bytes_per_card": False,
+}
+
+# Start-up time targets in seconds: CLI commands that must not import the
+# renderer, and the import of the renderer itself (for reference)
+STARTUP_TARGETS = {
+    "help": ([GENERATOR_PATH, "--help"], 0.15),
+    "list": ([GENERATOR_PATH, "--list"], 0.15),
+    "import_generator": (["-c", "import sys; sys.path.insert(0, sys.argv[1]); import trivia_cards.generator", TOOLS_DIR], None),
+}
+STARTUP_RUNS = 5
+
+# Vocabulary for synthetic questions: short and long words, de/fr accents and the Bitcoin symbol
+WORDS = [
+    "Bitcoin", "block", "node", "miner", "wallet", "key", "hash", "fee", "UTXO", "mempool",
+    "Satoshi", "Lightning", "Taproot", "SegWit", "halving", "difficulty", "signature", "script",
+    "₿", "0.1 ₿", "21", "Sats", "Blöcke", "Schlüssel", "Gebühren", "Börse", "réseau", "clé",
+    "portefeuille", "Preuve", "sécurité", "Transaktionsgebührenberechnung",
+    "Zahlungskanalnetzwerkinfrastruktur", "pseudo-anonymization", "double-spending",
+]
+
+def load_generator():
+    """Import the card generator module (this imports ReportLab)."""
+    from trivia_cards import generator
+    return generator
+
+def random_text(rng, min_words, max_words, question=False):
+    """Return a random sentence from the synthetic vocabulary."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    text = " ".join(words)
+    return text[0].upper() + text[1:] + ("?" if question else "")
+
+def make_synthetic_bank(count, seed=0):
+    """Build a question bank in the docs/lang/*.json schema."""
+    generator = load_generator()
+    rng = random.Random(seed)
+    difficulties = list(generator.DIFFICULTY_MAPPING)
+    categories = list(generator.CATEGORY_COLORS) + list(generator.CATEGORY_MAPPING)
+
+    questions = []
+    for _ in range(count):
+        # Mostly short questions, with a tail of very long ones
+        long_question = rng.random() < 0.1
+        options = [random_text(rng, 1, 12 if long_question else 6) for _ in range(4)]
+        questions.append({
+            "question": random_text(rng, 8, 40, question=True) if long_question else random_text(rng, 3, 14, question=True),
+            "options": options,
+            "answer": rng.randrange(len(options)),
+            "difficulty": rng.choice(difficulties),
+            "category": rng.choice(categories),
+        })
+    return questions
+
+def write_synthetic_bank(count, directory, seed=0):
+    """Write a synthetic bank to directory (once per size and seed) and return its path."""
+    path = os.path.join(directory, f"synthetic_{count}_{seed}.json")
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(make_synthetic_bank(count, seed), f, ensure_ascii=False, indent=2)
+    return path
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_single(json_file, output_dir):
+    """Benchmark one bank in the current process and return its metrics."""
+    generator = load_generator()
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import A4
+
+    # End to end: create_trivia_cards as the CLI runs it
+    output_pdf = os.path.join(output_dir, "benchmark.pdf")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        success, result_pdf = generator.create_trivia_cards(json_file, output_pdf)
+    total_sec = time.perf_counter() - start
+    if not success:
+        raise RuntimeError(f"create_trivia_cards fehlgeschlagen für {json_file}")
+    pdf_bytes = os.path.getsize(result_pdf)
+    os.remove(result_pdf)
+    rss = peak_rss_mb()
+
+    # Per stage: the same pipeline with each step timed separately
+    stages = {}
+    start = time.perf_counter()
+    with open(json_file, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+    stages["load"] = time.perf_counter() - start
+
+    width = generator.CARD_WIDTH - generator.SPACING
+    height = generator.CARD_HEIGHT - generator.SPACING
+    start = time.perf_counter()
+    layouts = [generator.layout_card(question, width, height) for question in questions]
+    stages["layout"] = time.perf_counter() - start
+
+    stage_pdf = os.path.join(output_dir, "benchmark_stages.pdf")
+    c = canvas.Canvas(stage_pdf, pagesize=A4)
+    slots = generator.card_slots(generator.IMPOSITION_PROFILES[generator.DEFAULT_IMPOSITION])
+    start = time.perf_counter()
+    for i, (question, layout) in enumerate(zip(questions, layouts)):
+        rel_idx = i % generator.CARDS_PER_PAGE
+        x, y = slots[rel_idx]
+        generator.draw_card(c, x, y, question, width, height, layout=layout)
+        if rel_idx == generator.CARDS_PER_PAGE - 1:
+            c.showPage()
+    stages["draw"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    c.save()
+    stages["save"] = time.perf_counter() - start
+    os.remove(stage_pdf)
+
+    # Text helpers on their own
+    texts = [question["question"] for question in questions[:2000]]
+    start = time.perf_counter()
+    wrapped = [generator.wrap_text(text, width - 30, generator.QUESTION_FONT, generator.QUESTION_FONT_SIZE) for text in texts]
+    stages["wrap_text"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for lines in wrapped:
+        generator.calculate_option_height(lines, 9)
+    stages["calculate_option_height"] = time.perf_counter() - start
+
+    return {
+        "cards": len(questions),
+        "total_sec": total_sec,
+        "cards_per_sec": len(questions) / total_sec if total_sec else 0.0,
+        "peak_rss_mb": rss,
+        "pdf_bytes": pdf_bytes,
+        "bytes_per_card": pdf_bytes / len(questions),
+        "stages_sec": stages,
+        "text_samples": len(texts),
+    }
+
+def run_in_subprocess(json_file, output_dir):
+    """Run run_single in a fresh interpreter so peak RSS belongs to this bank only."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--single", json_file, "--output-dir", output_dir],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(result.stdout)
+        print(result.stderr)
+        raise RuntimeError(f"Benchmark fehlgeschlagen für {json_file}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def measure_startup(runs=STARTUP_RUNS):
+    """Return the best-of-runs wall time in seconds of each STARTUP_TARGETS command."""
+    startup = {}
+    for name, (command, target) in STARTUP_TARGETS.items():
+        best = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable] + command, capture_output=True, check=True)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        startup[name] = best
+    return startup
+
+def check_startup(startup):
+    """Print the start-up times against their targets. Returns False if a target is missed."""
+    ok = True
+    print(f"\n{'Start':>16} {'Zeit ms':>8} {'Ziel ms':>8}")
+    for name, seconds in startup.items():
+        target = STARTUP_TARGETS[name][1]
+        missed = target is not None and seconds > target
+        marker = "  ZIEL VERFEHLT" if missed else ""
+        target_text = f"{target * 1000:8.0f}" if target is not None else f"{'-':>8}"
+        print(f"{name:>16} {seconds * 1000:8.1f} {target_text}{marker}")
+        ok = ok and not missed
+    return ok
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Print the change of each metric against the baseline. Returns False if something regressed beyond tolerance."""
+    ok = True
+    print(f"\n=== Vergleich mit Baseline (Toleranz {tolerance:.0%}) ===")
+    for size, metrics in results.items():
+        previous = baseline.get("results", {}).get(size)
+        if previous is None:
+            print(f"{size:>7} Karten: keine Baseline")
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regressed = change < -tolerance if higher_is_better else change > tolerance
+            marker = "  REGRESSION" if regressed else ""
+            print(f"{size:>7} Karten {metric:>14}: {old:12.2f} -> {new:12.2f} ({change:+.1%}){marker}")
+            ok = ok and not regressed
+    return ok
+
+def print_results(results):
+    """Print a table of the benchmark results."""
+    print(f"\n{'Karten':>7} {'Karten/s':>9} {'Gesamt s':>9} {'RSS MB':>7} {'PDF Bytes':>11}  Stufen (s)")
+    for size, metrics in results.items():
+        stages = " ".join(f"{name}={sec:.3f}" for name, sec in metrics["stages_sec"].items())
+        print(f"{size:>7} {metrics['cards_per_sec']:9.0f} {metrics['total_sec']:9.2f} "
+              f"{metrics['peak_rss_mb']:7.1f} {metrics['pdf_bytes']:11d}  {stages}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the Bitcoin Trivia card generator on synthetic question banks')
+    parser.add_argument('--sizes', default=",".join(str(size) for size in DEFAULT_SIZES), help='Comma separated bank sizes (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic banks')
+    parser.add_argument('--bank-dir', help='Directory for the generated banks (default: temporary directory)')
+    parser.add_argument('--output-dir', help='Directory for benchmark PDFs (default: temporary directory)')
+    parser.add_argument('--json-out', help='Write the results as JSON to this file (usable as --baseline later)')
+    parser.add_argument('--baseline', help='Compare against results previously written with --json-out')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='Allowed relative regression before failing (default: 0.10)')
+    parser.add_argument('--startup-runs', type=int, default=STARTUP_RUNS, help='Runs per start-up measurement, best one counts (default: %(default)s)')
+    parser.add_argument('--single', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        # Internal: benchmark one bank and print its metrics as JSON
+        print(json.dumps(run_single(args.single, args.output_dir or tempfile.gettempdir())))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bank_dir = args.bank_dir or temp_dir
+        output_dir = args.output_dir or temp_dir
+        os.makedirs(bank_dir, exist_ok=True)
+        os.makedirs(output_dir, exist_ok=True)
+
+        results = {}
+        for size in [int(size) for size in args.sizes.split(",") if size]:
+            print(f"Erzeuge Fragenkatalog mit {size} Karten...")
+            json_file = write_synthetic_bank(size, bank_dir, args.seed)
+            print(f"Messe {size} Karten...")
+            results[str(size)] = run_in_subprocess(json_file, output_dir)
+
+    print_results(results)
+
+    print("\nMesse Startzeiten...")
+    startup = measure_startup(args.startup_runs)
+    startup_ok = check_startup(startup)
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump({"seed": args.seed, "results": results, "startup_sec": startup}, f, indent=2)
+        print(f"\nErgebnisse gespeichert: {args.json_out}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if not compare_to_baseline(results, baseline, args.tolerance):
+            sys.exit(1)
+
+    if not startup_ok:
+        sys.exit(1)
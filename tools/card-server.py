@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+"""
+Bitcoin Trivia Card Render Service
+Local HTTP service that renders decks on demand from worker processes with warm logo and font caches.
+
+Run from the repository root:
+
+    python tools/card-server.py --port 8765 --workers 2
+
+POST /render with a JSON body returns the PDF. The body holds either the cards
+themselves or a language plus the same selection options as card-generator.py:
+
+    {"questions": [{"question": ..., "options": [...], "answer": 0, "difficulty": ..., "category": ...}]}
+    {"lang": "de", "difficulty": ["SATOSHI"], "category": ["Technology and Security"],
+     "ids": "0-50", "sample": 30, "seed": 1, "per_category": false, "auto_fit": true}
+
+GET /health returns the service status and the summed worker metrics as JSON.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from trivia_cards import generator
+from trivia_cards.validate import check_question
+
+# Largest accepted request body (bytes)
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+HTTP_STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+def init_worker(reproducible=False):
+    """Worker process initializer: quiet page logging and fill the caches before the first request."""
+    generator.LOG_PAGES = False
+    generator.REPRODUCIBLE = reproducible
+    generator.warm_caches()
+
+def language_files():
+    """Return {language code: JSON file} for the language files the generator finds."""
+    return {os.path.splitext(os.path.basename(path))[0]: path for path in generator.find_json_files()}
+
+def is_int(value):
+    """True for a JSON integer (not a boolean)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def string_list(request, field):
+    """Return a list field of a request, raising ValueError unless it is a list of strings."""
+    values = request.get(field) or []
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError(f"'{field}' muss eine Liste von Texten sein")
+    return values
+
+def question_filter_from_request(request):
+    """Build a QuestionFilter from the selection fields of a request, or None if there are none.
+
+    Raises ValueError for a field of the wrong type or an unknown value.
+    """
+    if not any(request.get(field) for field in ("difficulty", "category", "ids", "sample")):
+        return None
+    difficulties = []
+    known_difficulties = set(generator.DIFFICULTY_MAPPING.values())
+    for difficulty in string_list(request, "difficulty"):
+        if generator.normalize_difficulty(difficulty) not in known_difficulties:
+            raise ValueError(f"Unbekannte Schwierigkeit: {difficulty}")
+        difficulties.append(generator.normalize_difficulty(difficulty))
+    categories = []
+    for category in string_list(request, "category"):
+        mapped = generator.normalize_category(category)
+        if mapped is None:
+            raise ValueError(f"Unbekannte Kategorie: {category}")
+        categories.append(mapped)
+    ids = request.get("ids")
+    if isinstance(ids, str):
+        try:
+            ids = generator.parse_question_ids(ids)
+        except ValueError:
+            raise ValueError(f"Ungültige 'ids' Angabe: {ids} (Beispiel: 3,5,10-20)") from None
+    elif ids is not None:
+        if not (isinstance(ids, list) and all(is_int(i) for i in ids)):
+            raise ValueError("'ids' muss ein Text wie \"3,5,10-20\" oder eine Liste von Zahlen sein")
+        ids = [(i, i) for i in ids]
+    sample = request.get("sample")
+    if sample is not None and not (is_int(sample) and sample > 0):
+        raise ValueError("'sample' muss eine positive Zahl sein")
+    seed = request.get("seed", 0)
+    if not is_int(seed):
+        raise ValueError("'seed' muss eine Zahl sein")
+    return generator.QuestionFilter(
+        difficulties or None,
+        categories or None,
+        ids or None,
+        sample,
+        seed,
+        bool(request.get("per_category")),
+    )
+
+def check_questions(questions):
+    """Raise ValueError for posted cards that fail the schema checks of --validate."""
+    if not isinstance(questions, list):
+        raise ValueError("'questions' muss eine Liste sein")
+    for index, question in enumerate(questions):
+        errors = [issue.message for issue in check_question("questions", index, question) if issue.severity == "error"]
+        if errors:
+            raise ValueError(f"Frage #{index}: {'; '.join(errors)}")
+
+def render_request(request):
+    """Render one request in a worker process. Returns (pdf_bytes, overflow_cards, metrics)."""
+    generator.METRICS.reset()
+    if not isinstance(request, dict):
+        raise ValueError("Die Anfrage muss ein JSON-Objekt sein")
+    auto_fit = bool(request.get("auto_fit"))
+    if "questions" in request:
+        check_questions(request["questions"])
+        pdf, overflow_cards = generator.render_deck(request["questions"], auto_fit=auto_fit)
+    else:
+        json_file = language_files().get(request.get("lang"))
+        if json_file is None:
+            raise ValueError(f"Unbekannte Sprache: {request.get('lang')}")
+        pdf, overflow_cards = generator.render_deck(json_file=json_file,
+                                                    question_filter=question_filter_from_request(request),
+                                                    auto_fit=auto_fit)
+    return pdf, overflow_cards, generator.METRICS.as_dict()
+
+
+class RenderService:
+    """Minimal HTTP/1.1 server; rendering runs in a shared process pool so requests queue instead of spawning."""
+
+    def __init__(self, workers, reproducible=False):
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(reproducible,))
+        self.started = time.time()
+        self.active = 0
+        self.served = 0
+        self.failed = 0
+        self.metrics = generator.BuildMetrics()
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY_BYTES:
+                await self.respond(writer, 413, {"error": "Anfrage zu groß"})
+                return
+            body = await reader.readexactly(length) if length else b""
+            await self.route(writer, method, path.split("?", 1)[0], body)
+        except Exception as e:
+            await self.respond(writer, 400, {"error": str(e)})
+        finally:
+            writer.close()
+
+    async def route(self, writer, method, path, body):
+        if path == "/health":
+            await self.respond(writer, 200, self.status())
+        elif path == "/render":
+            if method != "POST":
+                await self.respond(writer, 405, {"error": "Nur POST erlaubt"})
+                return
+            await self.render(writer, json.loads(body or b"{}"))
+        else:
+            await self.respond(writer, 404, {"error": f"Unbekannter Pfad: {path}"})
+
+    async def render(self, writer, request):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self.active += 1
+        try:
+            pdf, overflow_cards, worker_metrics = await loop.run_in_executor(self.executor, render_request, request)
+        except ValueError as e:
+            self.failed += 1
+            await self.respond(writer, 400, {"error": str(e)})
+            return
+        except Exception as e:
+            self.failed += 1
+            await self.respond(writer, 500, {"error": str(e)})
+            return
+        finally:
+            self.active -= 1
+
+        self.served += 1
+        self.metrics.merge(worker_metrics)
+        elapsed = time.perf_counter() - start
+        print(f"Deck gerendert: {worker_metrics['counters'].get('cards', 0)} Karten, {len(pdf)} Bytes, {elapsed:.3f}s")
+        await self.respond(writer, 200, pdf, "application/pdf",
+                           {"X-Cards": worker_metrics["counters"].get("cards", 0),
+                            "X-Overflow-Cards": len(overflow_cards)})
+
+    def status(self):
+        return {
+            "workers": self.workers,
+            "active": self.active,
+            "served": self.served,
+            "failed": self.failed,
+            "uptime_sec": time.time() - self.started,
+            "languages": sorted(language_files()),
+            "metrics": self.metrics.as_dict(),
+        }
+
+    async def respond(self, writer, status, payload, content_type="application/json", extra_headers=None):
+        if content_type == "application/json":
+            payload = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": content_type, "Content-Length": len(payload), "Connection": "close"}
+        headers.update(extra_headers or {})
+        head = f"HTTP/1.1 {status} {HTTP_STATUS[status]}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode("latin-1") + b"\r\n" + payload)
+        await writer.drain()
+
+    async def serve(self, host, port):
+        # Start every worker now so the first requests do not pay for process start and cache warm-up
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.executor, generator.get_timestamp) for _ in range(self.workers)])
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Render-Service läuft auf http://{host}:{port} mit {self.workers} Prozessen")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve Bitcoin Trivia card decks over local HTTP')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Number of render worker processes (default: CPU count)')
+    parser.add_argument('--reproducible', action='store_true', default=False, help='Return byte-identical PDFs for identical requests (also enabled by SOURCE_DATE_EPOCH)')
+    args = parser.parse_args()
+
+    service = RenderService(args.workers, args.reproducible or bool(os.environ.get("SOURCE_DATE_EPOCH", "").strip()))
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Render-Service beendet.")
+    finally:
+        service.executor.shutdown()
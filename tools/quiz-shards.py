@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+"""
+Bitcoin Trivia Quiz Shard Builder
+Splits docs/lang/*.json into compact per-language, per-level files for the web quiz.
+The implementation lives in trivia_cards.shards, which --validate uses to report stale shards.
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from trivia_cards.shards import INDEX_NAME, LANG_DIR, SHARD_DIR, build_quiz_shards
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build compact per-level question shards for the web quiz')
+    parser.add_argument('--lang-dir', default=LANG_DIR, help='Directory with the language JSON files (default: %(default)s)')
+    parser.add_argument('--output', default=SHARD_DIR, help='Directory for the shards and index.json (default: %(default)s)')
+    args = parser.parse_args()
+
+    index = build_quiz_shards(args.lang_dir, args.output)
+    print(f"Index geschrieben: {os.path.join(args.output, INDEX_NAME)} (Version {index['version']})")
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(TOOLS_DIR)
+
+sys.path.insert(0, TOOLS_DIR)
+
+# Runs card-generator.py with worker processes started by sys.argv[1] instead of fork
+START_METHOD_RUNNER = """
+import multiprocessing, runpy, sys
+multiprocessing.set_start_method(sys.argv[1])
+sys.argv = sys.argv[2:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    """A working directory like the repo root: the generator writes its PDFs next to docs/ and tools/."""
+    os.symlink(os.path.join(REPO_DIR, "docs"), tmp_path / "docs")
+    os.symlink(TOOLS_DIR, tmp_path / "tools")
+    return tmp_path
+
+def run_generator(workdir, *args, start_method=None):
+    """Run card-generator.py in workdir and return the CompletedProcess."""
+    command = [os.path.join("tools", "card-generator.py"), *args]
+    if start_method:
+        command = ["-c", START_METHOD_RUNNER, start_method, *command]
+    return subprocess.run([sys.executable, *command], cwd=workdir, capture_output=True, text=True, timeout=300)
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from trivia_cards.bank import BANK_HEADER, QuestionBank, bank_file_name, compile_bank, compile_banks
+
+QUESTIONS = [
+    {"question": "Wer schrieb das \"Whitepaper\"?", "options": ["Satoshi", "Hal", "Adam", "Nick"], "answer": 0,
+     "difficulty": "curious", "category": "Geschichte", "source": "nicht in der Bank"},
+    {"question": "Что такое ₿ и 😀?", "options": ["Биткойн", "\\u20bf", "", "Ω"], "answer": 3,
+     "difficulty": "satoshi", "category": "Технологии"},
+    {"question": "Wie viele Satoshi hat ein Bitcoin?", "options": ["100000000", "Satoshi"], "answer": 0,
+     "difficulty": "curious", "category": "Geschichte"},
+]
+
+
+@pytest.fixture
+def bank_file(tmp_path):
+    json_file = tmp_path / "ru.json"
+    json_file.write_text(json.dumps(QUESTIONS, ensure_ascii=False), encoding="utf-8")
+    assert compile_banks([str(json_file)], str(tmp_path / "banks"))
+    return bank_file_name(str(json_file), str(tmp_path / "banks"))
+
+def test_bank_matches_json_load(bank_file):
+    bank = QuestionBank(bank_file)
+    try:
+        assert len(bank) == len(QUESTIONS)
+        for question, expected in zip(bank, QUESTIONS):
+            # Fields outside QUESTION_FIELDS are not compiled
+            assert question.to_dict() == {field: expected[field] for field in question.keys()}
+        assert bank[-1]["options"] == QUESTIONS[-1]["options"]
+        assert bank[1].get("source") is None
+        with pytest.raises(IndexError):
+            bank[len(QUESTIONS)]
+    finally:
+        bank.close()
+
+def test_bank_positions(bank_file):
+    bank = QuestionBank(bank_file)
+    try:
+        assert bank.positions("difficulty") == {"curious": [0, 2], "satoshi": [1]}
+        assert bank.positions("category") == {"Geschichte": [0, 2], "Технологии": [1]}
+    finally:
+        bank.close()
+
+def test_bank_without_questions(tmp_path):
+    json_file = tmp_path / "empty.json"
+    json_file.write_text("[]", encoding="utf-8")
+    bank_file = str(tmp_path / "empty.bank")
+    assert compile_bank(str(json_file), bank_file)[:2] == (0, 0)
+    bank = QuestionBank(bank_file)
+    assert len(bank) == 0 and list(bank) == []
+    bank.close()
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: b"",
+    lambda data: data[:BANK_HEADER.size - 1],
+    lambda data: b"XXXX" + data[4:],
+    lambda data: data[:4] + b"\x02\x00" + data[6:],
+])
+def test_not_a_bank(bank_file, corrupt):
+    with open(bank_file, 'rb') as f:
+        data = f.read()
+    with open(bank_file, 'wb') as f:
+        f.write(corrupt(data))
+    with pytest.raises(ValueError):
+        QuestionBank(bank_file)
+
+def test_truncated_bank(bank_file):
+    with open(bank_file, 'rb') as f:
+        data = f.read()
+    # Cut inside every section, from the first record to the last string byte, and append to it
+    for corrupt in [data[:size] for size in range(BANK_HEADER.size, len(data))] + [data + b"\0\0\0\0"]:
+        with open(bank_file, 'wb') as f:
+            f.write(corrupt)
+        with pytest.raises(ValueError):
+            QuestionBank(bank_file)
+
+@pytest.mark.parametrize("questions", [
+    {"question": "kein Array"},
+    [{"question": "ohne Antwort", "options": ["a"], "difficulty": "curious", "category": "Technik"}],
+    [{"question": "Antwort als Text", "options": ["a"], "answer": "0", "difficulty": "curious",
+      "category": "Technik"}],
+    [{"question": "Stufen als Liste", "options": ["a"], "answer": 0, "difficulty": ["curious"],
+      "category": "Technik"}],
+])
+def test_invalid_questions_are_not_compiled(tmp_path, questions):
+    json_file = tmp_path / "de.json"
+    json_file.write_text(json.dumps(questions), encoding="utf-8")
+    with pytest.raises(ValueError):
+        compile_bank(str(json_file), str(tmp_path / "de.bank"))
+    assert not compile_banks([str(json_file)], str(tmp_path))
+    assert not (tmp_path / "de.bank").exists()
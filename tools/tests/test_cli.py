@@ -0,0 +1,48 @@
+import os
+
+import reportlab
+
+from conftest import run_generator
+
+
+def test_over_budget_deck_fails_the_build(workdir):
+    result = run_generator(workdir, "--json", os.path.join("docs", "lang", "de.json"),
+                           "--max-bytes-per-card", "10", "--reproducible", "--no-page-log")
+
+    assert result.returncode == 1, result.stdout
+    pdfs = sorted(path.name for path in workdir.iterdir() if path.suffix == ".pdf")
+    # Renamed so it is not taken for a finished deck, and no fallback to the other languages
+    assert pdfs == ["bitcoin_trivia_cards.overbudget.pdf"]
+
+def test_page_jobs_match_the_serial_build_without_fork(workdir):
+    # Shard workers that are not forked only know the settings they are handed
+    common = ("--json", os.path.join("docs", "lang", "de.json"), "--reproducible", "--optimize", "--no-page-log")
+    serial = run_generator(workdir, *common, "--output", "serial.pdf")
+    sharded = run_generator(workdir, *common, "--output", "sharded.pdf", "--page-jobs", "2",
+                            start_method="forkserver")
+
+    assert serial.returncode == 0, serial.stdout
+    assert sharded.returncode == 0, sharded.stdout
+    assert (workdir / "serial.pdf").read_bytes() == (workdir / "sharded.pdf").read_bytes()
+
+def test_raster_workers_use_the_card_font_without_fork(workdir):
+    font = os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+    common = ("--json", os.path.join("docs", "lang", "de.json"), "--raster", "png", "--raster-dpi", "40",
+              "--ids", "0-39", "--font", font)
+    serial = run_generator(workdir, *common, "--raster-dir", "serial")
+    pooled = run_generator(workdir, *common, "--raster-dir", "pooled", "--raster-jobs", "2", start_method="spawn")
+
+    assert serial.returncode == 0, serial.stdout
+    assert pooled.returncode == 0, pooled.stdout
+    names = sorted(path.name for path in (workdir / "serial" / "de").glob("*.png"))
+    assert len(names) == 40
+    for name in names:
+        assert (workdir / "serial" / "de" / name).read_bytes() == (workdir / "pooled" / "de" / name).read_bytes(), name
+
+def test_empty_selection_fails_without_rendering_other_languages(workdir):
+    result = run_generator(workdir, "--json", os.path.join("docs", "lang", "de.json"), "--ids", "100000-100000000",
+                           "--reproducible", "--no-page-log")
+
+    assert result.returncode == 1, result.stdout
+    assert "Keine Karten ausgewählt" in result.stdout
+    assert not [path for path in workdir.iterdir() if path.suffix == ".pdf"]
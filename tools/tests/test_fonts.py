@@ -0,0 +1,43 @@
+import json
+import os
+import re
+
+import reportlab
+
+from conftest import run_generator
+
+FONT_DIR = os.path.join(os.path.dirname(reportlab.__file__), "fonts")
+
+
+def render_vera_deck(workdir, output):
+    result = run_generator(workdir, "--json", os.path.join("docs", "lang", "de.json"), "--reproducible",
+                           "--no-page-log", "--output", output, "--font", os.path.join(FONT_DIR, "Vera.ttf"),
+                           "--font-bold", os.path.join(FONT_DIR, "VeraBd.ttf"))
+    assert result.returncode == 0, result.stdout
+    return (workdir / output).read_bytes()
+
+def test_ttf_deck_embeds_font_subsets(workdir):
+    pdf = render_vera_deck(workdir, "parsed.pdf")
+
+    assert sorted(re.findall(rb"/BaseFont /[A-Z]{6}\+(\S+)", pdf)) == [b"BitstreamVeraSans-Bold",
+                                                                       b"BitstreamVeraSans-Roman"]
+    assert len(re.findall(rb"/FontFile2 \d+ 0 R", pdf)) == 2
+
+def test_ttf_deck_from_the_font_cache_is_identical(workdir):
+    parsed = render_vera_deck(workdir, "parsed.pdf")
+    assert any(name.endswith(".json") for name in os.listdir(workdir / ".cache" / "fonts"))
+
+    # The second run takes the character tables and subsets from .cache/fonts
+    assert render_vera_deck(workdir, "cached.pdf") == parsed
+
+def test_answer_sheet_uses_the_card_fonts(workdir):
+    questions = json.loads((workdir / "docs" / "lang" / "de.json").read_text(encoding="utf-8"))[:9]
+    questions[0] = dict(questions[0], options=["Биткойн", "Ελληνικά", "(x)", "y\\z"], answer=0)
+    (workdir / "cyrillic.json").write_text(json.dumps(questions, ensure_ascii=False), encoding="utf-8")
+    result = run_generator(workdir, "--json", "cyrillic.json", "--reproducible", "--no-page-log", "--answers",
+                           "--font", os.path.join(FONT_DIR, "Vera.ttf"))
+    assert result.returncode == 0, result.stdout
+
+    answers = (workdir / "bitcoin_trivia_cards_answers.pdf").read_bytes()
+    assert re.findall(rb"/BaseFont /[A-Z]{6}\+(\S+)", answers) == [b"BitstreamVeraSans-Roman"]
+    assert b"/FontFile2" in answers
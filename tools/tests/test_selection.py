@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from trivia_cards import generator
+from trivia_cards.bank import compile_bank
+from trivia_cards.generator import (QuestionFilter, build_question_index, get_question_index, iter_indexed_questions,
+                                    parse_question_ids, positioned_questions, select_question_ids)
+
+QUESTIONS = [
+    {"question": f"Frage {number}: ₿, ü und 😀", "options": ["Ja", "Nein", "Щ"], "answer": number % 3,
+     "difficulty": ("curious", "bitcoiner", "satoshi")[number % 3],
+     "category": ("Bitcoin-Geschichte und Adoption", "Technology and Security")[number % 2]}
+    for number in range(12)
+]
+
+
+def question_filter(**fields):
+    return QuestionFilter(**{**dict.fromkeys(QuestionFilter._fields), "seed": 0, "per_category": False, **fields})
+
+@pytest.fixture
+def questions_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(generator, "INDEX_CACHE_DIR", str(tmp_path / "card-index"))
+    monkeypatch.setattr(generator, "QUESTION_INDEXES", {})
+    path = tmp_path / "de.json"
+    # Multi-byte characters make byte and character offsets differ
+    path.write_text(json.dumps(QUESTIONS, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+def test_parse_question_ids_merges_ranges():
+    assert parse_question_ids("10-20, 3,5,4 ,15-25,,27") == [(3, 5), (10, 25), (27, 27)]
+
+def test_parse_question_ids_keeps_huge_ranges_as_pairs():
+    assert parse_question_ids("0-100000000") == [(0, 100000000)]
+
+@pytest.mark.parametrize("value", ["a", "1-b", "-3", "1.5"])
+def test_parse_question_ids_rejects_non_numbers(value):
+    with pytest.raises(ValueError):
+        parse_question_ids(value)
+
+def test_selected_ids_are_clamped_to_the_file():
+    index = {"count": 10, "difficulty": {}, "category": {}}
+    selection = question_filter(ids=parse_question_ids("2,8-100000000"))
+    assert select_question_ids(index, selection) == [2, 8, 9]
+
+def test_index_reads_the_same_questions_as_json_load(questions_file):
+    index = build_question_index(questions_file)
+    assert index["count"] == len(QUESTIONS)
+    assert list(iter_indexed_questions(questions_file, index, range(len(QUESTIONS)))) == QUESTIONS
+    assert list(iter_indexed_questions(questions_file, index, [11, 0, 5])) == [QUESTIONS[i] for i in (11, 0, 5)]
+    assert index["difficulty"]["CYPHERPUNK"] == [1, 4, 7, 10]
+    assert index["category"]["Bitcoin History and Adoption"] == [0, 2, 4, 6, 8, 10]
+
+@pytest.mark.parametrize("selection", [
+    question_filter(),
+    question_filter(ids=parse_question_ids("1-4,9-100")),
+    question_filter(difficulties=["satoshi"], categories=["technology and security"]),
+    question_filter(categories=["Bitcoin-Geschichte und Adoption"], sample=2, seed=7, per_category=True),
+    question_filter(difficulties=["BITCOINER", "cypherpunk"], sample=5, seed=3),
+])
+def test_json_and_bank_select_the_same_questions(questions_file, tmp_path, selection):
+    bank_file = str(tmp_path / "de.bank")
+    compile_bank(str(questions_file), bank_file)
+    json_ids, json_questions = positioned_questions(str(questions_file), selection)
+    bank_ids, bank_questions = positioned_questions(bank_file, selection)
+    assert list(json_ids) == list(bank_ids)
+    assert list(json_questions) == [question.to_dict() for question in bank_questions]
+
+def test_index_is_rebuilt_when_the_file_changes(questions_file):
+    assert get_question_index(str(questions_file))["count"] == len(QUESTIONS)
+    questions_file.write_text(json.dumps(QUESTIONS[:5], ensure_ascii=False), encoding="utf-8")
+    index = get_question_index(str(questions_file))
+    assert index["count"] == 5
+    assert list(iter_indexed_questions(questions_file, index, range(5))) == QUESTIONS[:5]
+
+@pytest.mark.parametrize("cached", ['{"version": 0}', '{"count": 1', ''])
+def test_stale_or_corrupt_cached_index_is_rebuilt(questions_file, cached):
+    index = get_question_index(str(questions_file))
+    cache_path = generator.index_cache_path(index["digest"])
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        f.write(cached)
+    generator.QUESTION_INDEXES.clear()
+    assert get_question_index(str(questions_file)) == index
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        assert json.load(f) == index
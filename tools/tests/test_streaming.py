@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from trivia_cards.generator import iter_questions
+
+QUESTIONS = [
+    {"question": "Wer schrieb das \"Whitepaper\"?", "options": ["Satoshi", "Hal", "Adam", "Nick"], "answer": 0,
+     "difficulty": "curious", "category": "Geschichte"},
+    {"question": "Pfad C:\\\\wallet\\\\ oder [Klammern], {Geschweifte} und Kommas, ]", "options": ["a", "b"],
+     "answer": 1, "difficulty": ["bitcoiner", "satoshi"], "category": "Technik"},
+    {"question": "Unicode: ₿, é, \u00fc und 😀", "options": ["\u20bf", "\\u20bf"], "answer": 0,
+     "difficulty": "satoshi", "category": "Wirtschaft"},
+]
+
+
+@pytest.fixture
+def questions_file(tmp_path):
+    path = tmp_path / "questions.json"
+    # ensure_ascii writes \\u escapes and surrogate pairs that chunk boundaries can split
+    path.write_text(" \n" + json.dumps(QUESTIONS * 5, ensure_ascii=True, indent=1) + "\n", encoding="utf-8")
+    return path
+
+def test_streamed_questions_match_json_load(questions_file):
+    expected = json.loads(questions_file.read_text(encoding="utf-8"))
+    # Small chunks put boundaries inside strings, escapes and between separators
+    for chunk_size in (1, 2, 3, 7, 16, 64, 1 << 16):
+        assert list(iter_questions(questions_file, chunk_size)) == expected, chunk_size
+
+def test_streamed_questions_in_compact_utf8(tmp_path):
+    path = tmp_path / "compact.json"
+    path.write_text(json.dumps(QUESTIONS, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    for chunk_size in (1, 5, 1 << 16):
+        assert list(iter_questions(path, chunk_size)) == QUESTIONS
+
+def test_empty_array(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text("[ ]", encoding="utf-8")
+    assert list(iter_questions(path, 1)) == []
+
+def test_truncated_file_is_an_error(tmp_path):
+    path = tmp_path / "truncated.json"
+    text = json.dumps(QUESTIONS)
+    path.write_text(text[:len(text) // 2], encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_questions(path, 8))
+
+def test_missing_closing_bracket_is_an_error(tmp_path):
+    path = tmp_path / "unclosed.json"
+    path.write_text(json.dumps(QUESTIONS)[:-1], encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_questions(path, 8))
+
+def test_file_without_array_is_rejected(tmp_path):
+    path = tmp_path / "object.json"
+    path.write_text(json.dumps({"questions": QUESTIONS}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_questions(path))
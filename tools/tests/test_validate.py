@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from trivia_cards.validate import check_duplicates, find_near_duplicates, shingles
+
+
+def brute_force_near_duplicates(texts, threshold):
+    """All-pairs reference: every j against the first earlier i that is similar enough."""
+    sets = [shingles(text) for text in texts]
+    pairs = []
+    for j in range(len(texts)):
+        for i in range(j):
+            similarity = len(sets[i] & sets[j]) / len(sets[i] | sets[j])
+            if similarity >= threshold:
+                pairs.append((i, j, similarity))
+                break
+    return pairs
+
+def similar_texts(count, seed):
+    """Random questions from a small vocabulary, with some copied and slightly edited."""
+    rng = random.Random(seed)
+    words = "bitcoin block satoshi mining wallet key node hash fee halving Über Блок ₿".split()
+    texts = []
+    for _ in range(count):
+        if texts and rng.random() < 0.4:
+            text = rng.choice(texts).split()
+            text[rng.randrange(len(text))] = rng.choice(words)
+            texts.append(" ".join(text))
+        else:
+            texts.append(" ".join(rng.choice(words) for _ in range(rng.randint(1, 15))))
+    return texts
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 1.0])
+@pytest.mark.parametrize("seed", range(5))
+def test_near_duplicates_match_all_pairs(threshold, seed):
+    texts = similar_texts(150, seed)
+    assert find_near_duplicates(texts, threshold) == brute_force_near_duplicates(texts, threshold)
+
+def test_case_and_punctuation_are_ignored():
+    texts = ["Wer hat Bitcoin erfunden?", "Wann wurde der erste Block gemined?", "WER hat Bitcoin erfunden!"]
+    assert find_near_duplicates(texts) == [(0, 2, 1.0)]
+
+def test_different_questions_are_not_reported():
+    texts = ["Wie viele Bitcoin wird es maximal geben?", "Wie viele Satoshi hat ein Bitcoin?",
+             "Was ist ein Halving?"]
+    assert find_near_duplicates(texts) == []
+
+def test_duplicate_warnings_use_file_positions():
+    questions = [
+        {"question": "Was ist ein Halving im Bitcoin-Netzwerk?"},
+        "keine Frage",
+        {"question": None},
+        {"question": "Was ist ein Halving im Bitcoin Netzwerk"},
+        {"question": "Was ist ein Halving im Bitcoin-Netzwerk heute?"},
+    ]
+    issues = check_duplicates("de.json", questions, threshold=0.6)
+    assert [(issue.severity, issue.index, issue.message) for issue in issues] == [
+        ("warning", 3, "Duplikat wie Frage #0"),
+        ("warning", 4, "fast gleich (83%) wie Frage #0"),
+    ]
@@ -0,0 +1,51 @@
+import json
+import os
+import re
+
+import pytest
+
+from conftest import REPO_DIR
+from trivia_cards.watch import WatchedDeck
+
+
+def save_questions(deck, questions):
+    with open(deck.json_file, 'w', encoding='utf-8') as f:
+        json.dump(questions, f, ensure_ascii=False)
+
+def page_count(path):
+    with open(path, 'rb') as f:
+        return len(re.findall(rb"/Type /Page\b(?!s)", f.read()))
+
+@pytest.fixture
+def questions():
+    with open(os.path.join(REPO_DIR, "docs", "lang", "de.json"), encoding="utf-8") as f:
+        return json.load(f)[:20]
+
+@pytest.fixture
+def deck(workdir, monkeypatch, questions):
+    # The logo path is relative to the repository root
+    monkeypatch.chdir(workdir)
+    deck = WatchedDeck(str(workdir / "de.json"), str(workdir / "de.pdf"))
+    save_questions(deck, questions)
+    assert deck.rebuild() == 20
+    assert page_count(deck.output_pdf) == 3
+    return deck
+
+def test_deleted_cards_reuse_the_drawn_cards(deck, questions):
+    save_questions(deck, questions[1:])
+    assert deck.rebuild() == 0
+    assert page_count(deck.output_pdf) == 3
+
+    save_questions(deck, questions[2:11])
+    assert deck.rebuild() == 0
+    assert page_count(deck.output_pdf) == 1
+
+def test_edited_card_is_drawn_again(deck, questions):
+    questions[4] = dict(questions[4], question=questions[4]["question"] + "?")
+    save_questions(deck, questions)
+    assert deck.rebuild() == 1
+
+def test_empty_file_removes_the_pdf(deck):
+    save_questions(deck, [])
+    deck.rebuild()
+    assert not os.path.exists(deck.output_pdf)
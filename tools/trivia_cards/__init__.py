@@ -0,0 +1,27 @@
+"""
+Bitcoin Trivia card generator package.
+
+The rendering API is loaded from trivia_cards.generator on first use, so
+importing the package (or running the command line help) does not import ReportLab.
+"""
+
+import importlib
+
+# Names re-exported from trivia_cards.generator
+__all__ = [
+    "QuestionBank",
+    "QuestionFilter",
+    "create_trivia_cards",
+    "create_trivia_cards_incremental",
+    "get_question_index",
+    "process_all_languages",
+    "render_cards",
+    "render_deck",
+    "select_questions",
+    "warm_caches",
+]
+
+def __getattr__(name):
+    if name in __all__:
+        return getattr(importlib.import_module(".generator", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
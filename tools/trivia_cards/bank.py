@@ -0,0 +1,225 @@
+"""
+Compiled question banks: a compact columnar binary form of a language file
+that is memory-mapped instead of parsed. Questions are decoded lazily, one
+field at a time, so opening even a very large bank reads only its header.
+Does not import ReportLab, so banks can be compiled without the renderer.
+
+Layout (little-endian, every section a multiple of 4 bytes):
+
+    header          BANK_HEADER: magic, version, question, option and string counts
+    records         question_count x (question, answer, difficulty, category) int32;
+                    text fields are string ids
+    option offsets  question_count + 1 uint32 positions in the option column
+    options         option_count uint32 string ids
+    string offsets  string_count + 1 uint32 byte offsets in the string data
+    string data     UTF-8, every distinct string once
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+from .schema import QUESTION_FIELDS
+
+BANK_MAGIC = b"BTQB"
+BANK_VERSION = 1
+BANK_EXTENSION = ".bank"
+BANK_HEADER = struct.Struct("<4sHHIII")
+
+# Fields of a record, in order
+RECORD_FIELDS = ("question", "answer", "difficulty", "category")
+
+def is_bank_file(path):
+    """Return True if path names a compiled question bank."""
+    return path.endswith(BANK_EXTENSION)
+
+def bank_file_name(json_file, bank_dir):
+    """Return the bank file compiled from a language file: <bank_dir>/<language>.bank."""
+    return os.path.join(bank_dir, os.path.splitext(os.path.basename(json_file))[0] + BANK_EXTENSION)
+
+class BankQuestion:
+    """One question of a QuestionBank, read like a question dict; fields are decoded on access."""
+
+    __slots__ = ("bank", "index")
+
+    def __init__(self, bank, index):
+        self.bank = bank
+        self.index = index
+
+    def __getitem__(self, field):
+        return self.bank.field(self.index, field)
+
+    def get(self, field, default=None):
+        try:
+            return self.bank.field(self.index, field)
+        except KeyError:
+            return default
+
+    def keys(self):
+        return QUESTION_FIELDS
+
+    def __iter__(self):
+        return iter(QUESTION_FIELDS)
+
+    def to_dict(self):
+        return {field: self.bank.field(self.index, field) for field in QUESTION_FIELDS}
+
+    def __eq__(self, other):
+        if isinstance(other, BankQuestion):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def __reduce__(self):
+        # Handed to worker processes as a plain dict, the memory map stays here
+        return (dict, (self.to_dict(),))
+
+class QuestionBank:
+    """A compiled bank, memory-mapped read-only. Indexing and iteration give BankQuestions.
+
+    Raises ValueError if the file is not a bank of this version or is truncated.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("Fragenbanken können nur auf Little-Endian-Systemen gelesen werden")
+        self.path = path
+        with open(path, 'rb') as f:
+            # An empty file cannot be mapped
+            if os.fstat(f.fileno()).st_size < BANK_HEADER.size:
+                raise ValueError(f"Keine Fragenbank: {path}")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count, option_count, string_count = BANK_HEADER.unpack_from(self.map)
+        if magic != BANK_MAGIC or version != BANK_VERSION:
+            self.map.close()
+            raise ValueError(f"Keine Fragenbank der Version {BANK_VERSION}: {path}")
+
+        # The columns have fixed sizes, and the last string offset is the size of the string data
+        lengths = (4 * self.count, self.count + 1, option_count, string_count + 1)
+        strings_pos = BANK_HEADER.size + 4 * sum(lengths)
+        if (strings_pos > len(self.map)
+                or struct.unpack_from("<I", self.map, strings_pos - 4)[0] != len(self.map) - strings_pos):
+            self.map.close()
+            raise ValueError(f"Fragenbank ist unvollständig oder beschädigt: {path}")
+
+        # Zero-copy typed views of the columns
+        view = memoryview(self.map)
+        pos = BANK_HEADER.size
+        sections = []
+        for length, code in zip(lengths, ("i", "I", "I", "I")):
+            sections.append(view[pos:pos + 4 * length].cast(code))
+            pos += 4 * length
+        self.records, self.option_offsets, self.options, self.string_offsets = sections
+        self.strings = view[pos:]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not -self.count <= index < self.count:
+            raise IndexError("Frage außerhalb der Fragenbank")
+        return BankQuestion(self, index % self.count)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield BankQuestion(self, index)
+
+    def string(self, string_id):
+        """Decode one entry of the string table."""
+        return str(self.strings[self.string_offsets[string_id]:self.string_offsets[string_id + 1]], "utf-8")
+
+    def field(self, index, field):
+        """Decode one field of the question at index. Raises KeyError for an unknown field."""
+        if field == "options":
+            return [self.string(string_id)
+                    for string_id in self.options[self.option_offsets[index]:self.option_offsets[index + 1]]]
+        if field not in RECORD_FIELDS:
+            raise KeyError(field)
+        value = self.records[4 * index + RECORD_FIELDS.index(field)]
+        return value if field == "answer" else self.string(value)
+
+    def positions(self, field):
+        """Return {value: [question positions]} of the difficulty or category column."""
+        column = self.records[RECORD_FIELDS.index(field)::4]
+        by_string = {}
+        for index, string_id in enumerate(column):
+            by_string.setdefault(string_id, []).append(index)
+        return {self.string(string_id): ids for string_id, ids in by_string.items()}
+
+    def close(self):
+        """Release the views and unmap the file."""
+        for view in (self.records, self.option_offsets, self.options, self.string_offsets, self.strings):
+            view.release()
+        self.map.close()
+
+def compile_bank(json_file, bank_file):
+    """Compile a language file into a question bank. Returns (question_count, string_count, bank_bytes).
+
+    Only the fields in QUESTION_FIELDS are kept. Raises ValueError for a
+    question that lacks one of them or has one of the wrong type (see --validate).
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+    if not isinstance(questions, list):
+        raise ValueError(f"JSON-Datei enthält kein Array: {json_file}")
+
+    string_ids = {}
+    records = array("i")
+    option_offsets = array("I", [0])
+    options = array("I")
+    for position, question in enumerate(questions):
+        try:
+            texts = [question[field] for field in ("question", "difficulty", "category")]
+            answer = question["answer"]
+            question_options = question["options"]
+        except (KeyError, TypeError):
+            raise ValueError(f"Frage #{position}: Felder fehlen (--validate zeigt Details)") from None
+        if (not isinstance(question_options, list)
+                or not all(isinstance(text, str) for text in texts + question_options)
+                or not isinstance(answer, int) or isinstance(answer, bool)):
+            raise ValueError(f"Frage #{position}: Feld mit falschem Typ (--validate zeigt Details)")
+
+        question_text, difficulty, category = (string_ids.setdefault(text, len(string_ids)) for text in texts)
+        records.extend((question_text, answer, difficulty, category))
+        options.extend(string_ids.setdefault(option, len(string_ids)) for option in question_options)
+        option_offsets.append(len(options))
+
+    encoded = [text.encode("utf-8") for text in string_ids]
+    string_offsets = array("I", [0])
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+
+    temp_file = f"{bank_file}.tmp"
+    os.makedirs(os.path.dirname(bank_file) or ".", exist_ok=True)
+    with open(temp_file, 'wb') as f:
+        f.write(BANK_HEADER.pack(BANK_MAGIC, BANK_VERSION, 0, len(questions), len(options), len(string_ids)))
+        for column in (records, option_offsets, options, string_offsets):
+            if sys.byteorder != "little":
+                column.byteswap()
+            f.write(column.tobytes())
+        f.write(b"".join(encoded))
+    os.replace(temp_file, bank_file)
+    return len(questions), len(string_ids), os.path.getsize(bank_file)
+
+def compile_banks(json_files, bank_dir):
+    """Compile every language file into bank_dir. Returns True if all of them were compiled."""
+    success = True
+    for json_file in json_files:
+        bank_file = bank_file_name(json_file, bank_dir)
+        start = time.perf_counter()
+        try:
+            question_count, string_count, bank_bytes = compile_bank(json_file, bank_file)
+        except Exception as e:
+            print(f"Fehler beim Kompilieren von {json_file}: {str(e)}")
+            success = False
+            continue
+        elapsed = time.perf_counter() - start
+        print(f"{json_file} -> {bank_file}: {question_count} Fragen, {string_count} Texte, "
+              f"{bank_bytes} Bytes ({elapsed * 1000:.0f} ms)")
+    return success
@@ -0,0 +1,175 @@
+"""
+Command line entry point of the card generator. ReportLab is only imported
+once a command actually renders, so --help and --list start quickly.
+"""
+
+import argparse
+import os
+import sys
+import time
+import traceback
+
+from .bank import is_bank_file
+from .files import DEFAULT_BANK_DIR, DEFAULT_MANIFEST_PATH, find_json_files
+
+def build_parser():
+    """Return the argument parser of the card generator."""
+    parser = argparse.ArgumentParser(description='Generate Bitcoin Trivia cards for print')
+    parser.add_argument('--json', help='Path to a specific questions JSON file')
+    parser.add_argument('--output', default='bitcoin_trivia_cards.pdf', help='Output PDF file name when processing a single JSON file')
+    parser.add_argument('--answers', action='store_true', help='Also generate an answer sheet', default=False)  # Default to no answer sheets
+    parser.add_argument('--auto-fit', action='store_true', default=False, help='Use the largest font sizes that fit each card and report cards that overflow')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes when rendering all languages (default: 1)')
+    parser.add_argument('--stream', action='store_true', default=False, help='Read questions incrementally and spool every finished page to disk, keeping memory low for very large decks')
+    parser.add_argument('--page-jobs', type=int, default=1, help='Number of worker processes rendering page ranges of a single deck (default: 1)')
+    parser.add_argument('--incremental', action='store_true', default=False, help='Only rebuild decks whose inputs changed and write content-addressed file names')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST_PATH, help=f'Build manifest used by --incremental (default: {DEFAULT_MANIFEST_PATH})')
+    parser.add_argument('--difficulty', action='append', help='Only include cards of this difficulty as printed on the card (BITCOINER, CYPHERPUNK, SATOSHI); repeatable')
+    parser.add_argument('--category', action='append', help='Only include cards of this category, in English or as named in the language file; repeatable')
+    parser.add_argument('--ids', help='Only include the questions at these 0-based positions, e.g. 3,5,10-20')
+    parser.add_argument('--sample', type=int, help='Randomly pick N of the selected cards')
+    parser.add_argument('--per-category', action='store_true', default=False, help='With --sample, pick N cards from each category')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for --sample (default: 0)')
+    parser.add_argument('--list', action='store_true', default=False, help='List the language files that would be rendered and exit')
+    parser.add_argument('--validate', action='store_true', default=False, help='Check the question files (schema, alignment across languages, near-duplicates, stale quiz shards) and exit; exit status 1 on errors')
+    parser.add_argument('--duplicate-threshold', type=float, default=0.8, help='Shingle similarity from which --validate reports near-duplicate questions (default: 0.8)')
+    parser.add_argument('--compile-bank', action='store_true', default=False, help='Compile --json or every language file into a binary question bank (<lang>.bank in --bank-dir) and exit; render a bank with --json <lang>.bank')
+    parser.add_argument('--bank-dir', default=DEFAULT_BANK_DIR, help='Directory for --compile-bank (default: %(default)s)')
+    parser.add_argument('--imposition', action='append', help='Print layout to render each deck in: a4-3x3 (default), a4-3x3-duplex (answer backs), letter-2x4, single-bleed; repeatable, all layouts are painted in one pass')
+    parser.add_argument('--font', help='TrueType font file to print the cards in instead of Helvetica; it is embedded, so the Bitcoin symbol and all accents print natively if the font has them')
+    parser.add_argument('--font-bold', help='Bold TrueType font file for questions, labels and correct answers (default: the --font file)')
+    parser.add_argument('--optimize', action='store_true', default=False, help='Write smaller PDFs: binary streams, maximum compression and shared page resources')
+    parser.add_argument('--reproducible', action='store_true', default=False, help='Write byte-identical PDFs for identical inputs: no timestamp in file names, fixed document ID and dates (taken from SOURCE_DATE_EPOCH if set, which also enables this mode)')
+    parser.add_argument('--max-bytes-per-card', type=int, help='Fail a deck whose PDF is larger than this many bytes per card')
+    parser.add_argument('--raster', choices=['png', 'webp'], help='Export every card as an image of this format instead of a PDF')
+    parser.add_argument('--raster-dir', default=os.path.join('docs', 'assets', 'images', 'cards'), help='Directory for --raster images, one subdirectory per language (default: %(default)s)')
+    parser.add_argument('--raster-dpi', type=int, default=300, help='Resolution of --raster images (default: %(default)s)')
+    parser.add_argument('--raster-jobs', type=int, default=1, help='Number of worker processes rendering --raster images (default: 1)')
+    parser.add_argument('--watch', action='store_true', default=False, help='Keep running and re-render only the changed pages whenever a language file is saved')
+    parser.add_argument('--no-page-log', action='store_true', default=False, help='Do not print a progress line for every page')
+    parser.add_argument('--metrics-json', help='Write per-stage timings and counters as JSON to this file')
+    parser.add_argument('--profile', nargs='?', const='-', help='Run under cProfile and print the top functions; optionally dump the stats to a file')
+    return parser
+
+def list_json_files():
+    """Print the language files found by find_json_files."""
+    json_files = find_json_files()
+    if not json_files:
+        print("Keine JSON-Dateien gefunden!")
+    for json_file in json_files:
+        print(json_file)
+
+def run_raster_export(args):
+    """Export card images for --json or every language file."""
+    from .generator import question_filter_from_args
+    from .raster import export_card_images
+    
+    question_filter = question_filter_from_args(args)
+    if question_filter is False:
+        return
+    json_files = [args.json] if args.json else find_json_files()
+    for json_file in json_files:
+        if not os.path.exists(json_file):
+            print(f"Fehler: Die JSON-Datei '{json_file}' existiert nicht.")
+            continue
+        export_card_images(json_file, args.raster_dir, args.raster, args.raster_dpi, args.raster_jobs,
+                           args.auto_fit, question_filter)
+
+def run_watch(args):
+    """Watch --json or every language file and keep its PDF up to date."""
+    from .watch import WatchedDeck, watch
+    
+    if args.difficulty or args.category or args.ids or args.sample:
+        print("Fehler: --watch rendert immer ganze Dateien, Auswahloptionen werden nicht unterstützt.")
+        return
+    if args.font:
+        # Pages are reassembled from cached streams, which only works with the standard fonts
+        print("Fehler: --watch unterstützt keine eingebetteten Schriften (--font).")
+        return
+    # The watched deck is the default layout only, redrawn page by page in memory
+    ignored = [option for option, value in (("--imposition", args.imposition and args.imposition != ["a4-3x3"]),
+                                            ("--answers", args.answers), ("--stream", args.stream),
+                                            ("--page-jobs", args.page_jobs > 1), ("--incremental", args.incremental))
+               if value]
+    if ignored:
+        print(f"Fehler: --watch unterstützt {', '.join(ignored)} nicht.")
+        return
+    if args.json and is_bank_file(args.json):
+        # Changes are detected by re-reading the saved JSON file
+        print("Fehler: --watch beobachtet JSON-Dateien, keine kompilierten Fragenbanken.")
+        return
+    if args.json:
+        decks = [WatchedDeck(args.json, args.output, args.auto_fit)]
+    else:
+        decks = [WatchedDeck(json_file, f"bitcoin_trivia_cards_{os.path.splitext(os.path.basename(json_file))[0]}.pdf",
+                             args.auto_fit)
+                 for json_file in find_json_files()]
+    watch(decks)
+
+def run(argv=None):
+    """Parse the command line and run the requested command."""
+    try:
+        args = build_parser().parse_args(argv)
+        
+        # Commands that do not render never import ReportLab
+        if args.list:
+            list_json_files()
+            return
+        if args.validate:
+            from .validate import run_validation
+            json_files = [args.json] if args.json else find_json_files()
+            sys.exit(0 if run_validation(json_files, args.duplicate_threshold) else 1)
+        if args.compile_bank:
+            from .bank import compile_banks
+            json_files = [args.json] if args.json else find_json_files()
+            sys.exit(0 if compile_banks(json_files, args.bank_dir) else 1)
+        
+        from . import generator
+        generator.LOG_PAGES = not args.no_page_log
+        generator.OPTIMIZE_OUTPUT = args.optimize
+        generator.MAX_BYTES_PER_CARD = args.max_bytes_per_card
+        generator.REPRODUCIBLE = args.reproducible or bool(os.environ.get("SOURCE_DATE_EPOCH", "").strip())
+        if args.imposition:
+            for name in args.imposition:
+                if name not in generator.IMPOSITION_PROFILES:
+                    print(f"Fehler: Unbekanntes Drucklayout '{name}'. Verfügbar: {', '.join(generator.IMPOSITION_PROFILES)}")
+                    return
+            generator.IMPOSITIONS = tuple(dict.fromkeys(args.imposition))
+        if args.font_bold and not args.font:
+            print("Fehler: --font-bold braucht auch --font.")
+            return
+        if args.font:
+            try:
+                generator.set_card_fonts(args.font, args.font_bold)
+            except Exception as e:
+                print(f"Fehler: Schrift kann nicht geladen werden: {str(e)}")
+                return
+        
+        start = time.perf_counter()
+        if args.raster:
+            command = run_raster_export
+        elif args.watch:
+            command = run_watch
+        else:
+            command = generator.main
+        if args.profile:
+            import cProfile
+            import pstats
+            profiler = cProfile.Profile()
+            result = profiler.runcall(command, args)
+            if args.profile != '-':
+                profiler.dump_stats(args.profile)
+                print(f"Profil gespeichert: {args.profile}")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(30)
+        else:
+            result = command(args)
+        
+        if args.metrics_json:
+            generator.write_metrics_json(args.metrics_json, time.perf_counter() - start)
+        # Decks over --max-bytes-per-card fail the build even if the rest was fine
+        if result is False or generator.METRICS.counters.get("size_budget_exceeded"):
+            sys.exit(1)
+    
+    except Exception as e:
+        print(f"Unerwarteter Fehler: {str(e)}")
+        traceback.print_exc()
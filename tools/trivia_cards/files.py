@@ -0,0 +1,42 @@
+"""
+Locating question files and build outputs. Kept free of ReportLab so the
+command line can list files and print help without loading the renderer.
+"""
+
+import os
+import glob
+
+# Default incremental build manifest (--incremental / --manifest)
+DEFAULT_MANIFEST_PATH = "bitcoin_trivia_build_manifest.json"
+
+# Default directory of compiled question banks (--compile-bank / --bank-dir)
+DEFAULT_BANK_DIR = os.path.join(".cache", "banks")
+
+def find_json_files():
+    """Find all available JSON files in various locations."""
+    search_paths = [
+        os.path.join("docs", "lang", "*.json"),
+        #os.path.join("tools", "lang", "*.json"),
+        #os.path.join("lang", "*.json"),
+        #os.path.join("tools", "*.json"),
+        #os.path.join("docs", "lang_copy", "*.json"),
+        #os.path.join("tools", "lang_copy", "*.json"),
+        #os.path.join("lang_copy", "*.json")
+    ]
+    
+    json_files = []
+    found_paths = set()  # Verwenden eines Sets zur Vermeidung von Duplikaten
+    
+    for pattern in search_paths:
+        for file_path in glob.glob(pattern):
+            # Normalisiere den Pfad und überprüfe auf Duplikate
+            norm_path = os.path.normpath(file_path)
+            basename = os.path.basename(norm_path)
+            
+            # Prüfe, ob wir bereits eine Datei mit diesem Namen haben
+            # Wenn ja, überspringen wir die Datei
+            if basename not in found_paths:
+                found_paths.add(basename)
+                json_files.append(norm_path)
+    
+    return json_files
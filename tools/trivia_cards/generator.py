@@ -0,0 +1,2229 @@
+"""
+Bitcoin Trivia Card Generator
+Creates printable cards (9 per A4 page, or in other imposition profiles) based on the provided JSON question file.
+"""
+
+import json
+import os
+import traceback
+import datetime
+import re
+import random
+import hashlib
+import zlib
+import io
+import time
+import tempfile
+import contextlib
+import fnmatch
+from collections import namedtuple
+from weakref import WeakKeyDictionary
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import reportlab
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape, letter
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfdoc, pdfmetrics
+from reportlab.pdfbase.ttfonts import TTEncoding, TTFont, TTFontFace
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFDictionary, PDFFile, PDFName, PDFStream, xObjectName
+from reportlab.lib.utils import ImageReader
+from PIL import Image as PILImage
+
+from .bank import QuestionBank, is_bank_file
+from .files import DEFAULT_MANIFEST_PATH, find_json_files
+from .schema import CATEGORY_MAPPING, DIFFICULTY_MAPPING, OPTION_LETTERS
+
+# Define card dimensions for 3x3 grid on A4 paper
+A4_WIDTH, A4_HEIGHT = A4
+MARGIN = 10 * mm
+CARD_WIDTH = (A4_WIDTH - 2 * MARGIN) / 3
+CARD_HEIGHT = (A4_HEIGHT - 2 * MARGIN) / 3
+SPACING = 2 * mm
+
+# Define colors based on difficulty levels
+DIFFICULTY_COLORS = {
+    "BITCOINER": colors.Color(0.5, 0.8, 1),   # Light blue (was "curious")
+    "CYPHERPUNK": colors.Color(1, 0.8, 0.3),  # Gold (was "bitcoiner")
+    "SATOSHI": colors.Color(1, 0.5, 0.5)      # Light red (kept as "satoshi")
+}
+
+# Define English category colors
+CATEGORY_COLORS = {
+    "Bitcoin History and Adoption": colors.Color(0.2, 0.7, 0.4),  # Green
+    "Technology and Security": colors.Color(0.3, 0.3, 0.9),      # Blue
+    "Proof of Work and Mining": colors.Color(0.9, 0.6, 0.2)      # Orange
+}
+
+# Logo path
+LOGO_PATH = os.path.join("tools", "BitcoinTriviaV3_copy.png")
+
+# Logo box on the card (in points) and the resolution it is embedded at.
+# The source PNG is far larger than the 15pt box it is printed in, so it is
+# downscaled once per process instead of embedding the full-size image.
+LOGO_SIZE = 15
+LOGO_RENDER_DPI = 600
+
+# Cache of downscaled logo images per (path, size)
+LOGO_CACHE = {}
+
+# Text layout settings (fonts, sizes and padding in points)
+QUESTION_FONT = "Helvetica-Bold"
+QUESTION_FONT_SIZE = 11
+QUESTION_PADDING = 15
+OPTION_FONT = "Helvetica"
+OPTION_ANSWER_FONT = "Helvetica-Bold"
+OPTION_FONT_SIZES = (9, 8)  # Preferred size first, then fallbacks
+OPTION_LETTER_X = 10
+OPTION_TEXT_X = 25  # Leftmost option text x; moved right when the letter prefixes are wider
+OPTION_PREFIX_GAP = 2.5
+OPTION_RIGHT_PADDING = 10
+OPTION_MIN_SPACING = 5
+
+# Difficulty and category labels
+DIFFICULTY_LABEL_FONT = "Helvetica-Bold"
+CATEGORY_LABEL_FONT = "Helvetica"
+
+# Embedded TrueType card fonts (--font): PDF font names and the (regular, bold)
+# font files in use, None while the cards use the built-in Helvetica
+CARD_FONT_NAME = "CardFont"
+CARD_BOLD_FONT_NAME = "CardFont-Bold"
+CARD_FONT_FILES = None
+
+# True when the card fonts have a glyph for the Bitcoin symbol; Helvetica has none
+NATIVE_BITCOIN_SYMBOL = False
+
+# The character tables of TrueType fonts (as JSON) and their subsets are cached
+# on disk per font file content. Bump FONT_CACHE_VERSION when the format changes.
+FONT_CACHE_VERSION = 2
+FONT_CACHE_DIR = os.path.join(".cache", "fonts")
+
+# TrueType fonts loaded in this process per (font name, path), and font subsets by cache key
+TTF_FONTS = {}
+FONT_SUBSETS = {}
+
+# Font sizes tried by auto-fit, largest first (half-point steps)
+AUTO_FIT_QUESTION_SIZES = tuple(size / 2 for size in range(22, 13, -1))  # 11pt .. 7pt
+AUTO_FIT_OPTION_SIZES = tuple(size / 2 for size in range(18, 11, -1))    # 9pt .. 6pt
+
+# Memoized string widths per (font, size, word)
+WIDTH_CACHE = {}
+
+# Pre-computed layout of a card, painted by draw_card
+CardLayout = namedtuple("CardLayout", [
+    "difficulty", "difficulty_color", "category", "category_color",
+    "question_lines", "question_font_size", "question_line_height", "separator_y",
+    "option_font_size", "options", "overflow",
+])
+# text is the option before wrapping (wrap_text may break long words with a hyphen)
+OptionLayout = namedtuple("OptionLayout", ["prefix", "is_answer", "lines", "y", "text"])
+
+# One string of a card: baseline position in points from the card's lower left
+# corner; centred runs are centred on x
+TextRun = namedtuple("TextRun", ["x", "y", "text", "font_name", "font_size", "centred"])
+
+# Incremental builds: manifest format version. Bump it when the drawing code
+# changes in a way that is not captured by the layout settings below.
+MANIFEST_VERSION = 1
+
+# Grid of cards on each A4 page
+CARDS_PER_PAGE = 9
+CARDS_PER_ROW = 3
+
+# How cards are arranged on the printed sheets. Cards always have the same
+# trim size (CARD_WIDTH - SPACING by CARD_HEIGHT - SPACING); a profile sets the
+# paper, the grid, the (left, top) corner of the grid or None to centre it,
+# the gap between cards, the bleed around each card and whether every sheet
+# is followed by a back with the answers for duplex printing.
+ImpositionProfile = namedtuple("ImpositionProfile", "page_size columns rows margin gap bleed answer_backs")
+
+# Color bleed around cards cut by a print shop
+BLEED = 3 * mm
+
+IMPOSITION_PROFILES = {
+    # The classic 3x3 A4 sheet (the grid starts half a gap left of MARGIN)
+    "a4-3x3": ImpositionProfile(A4, 3, 3, (MARGIN - SPACING / 2, MARGIN), SPACING, 0, False),
+    # The same sheets, each followed by its answer back (flip on the long edge)
+    "a4-3x3-duplex": ImpositionProfile(A4, 3, 3, (MARGIN - SPACING / 2, MARGIN), SPACING, 0, True),
+    # 2 rows of 4 cards on US Letter in landscape
+    "letter-2x4": ImpositionProfile(landscape(letter), 4, 2, None, SPACING, 0, False),
+    # One card per page with bleed; the page boxes mark the trim size
+    "single-bleed": ImpositionProfile((CARD_WIDTH - SPACING + 2 * BLEED, CARD_HEIGHT - SPACING + 2 * BLEED),
+                                      1, 1, None, 0, BLEED, False),
+}
+DEFAULT_IMPOSITION = "a4-3x3"
+
+# Profiles every deck is rendered in (--imposition); all of them are painted
+# from the same card layouts in one pass
+IMPOSITIONS = (DEFAULT_IMPOSITION,)
+
+# Size of the answer letter on answer backs
+ANSWER_LETTER_FONT_SIZE = 36
+
+# Answer sheet (--answers): table blocks side by side on each A4 page, row
+# height and font size in points, and the x offsets of the number (right
+# aligned), difficulty, answer letter and answer text within a block
+ANSWER_SHEET_BLOCKS = 2
+ANSWER_ROW_HEIGHT = 9.5
+ANSWER_FONT_SIZE = 7
+ANSWER_COLUMNS = (22, 28, 86, 96)
+
+# Fonts used on the cards, registered in this order on every canvas so the
+# internal font names of sharded pages match the merged document
+DECK_FONTS = ("Helvetica", "Helvetica-Bold")
+
+# Pages rendered per worker task in sharded (--page-jobs) rendering
+SHARD_PAGES = 25
+
+# How each shared form XObject was built, by form name, so a merged
+# document can rebuild the forms used by pages rendered in other processes
+FORM_SPECS = {}
+
+# Read size used when streaming questions from a JSON file
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Whitespace and commas between the questions of a streamed JSON array
+ARRAY_SEPARATORS = re.compile(r"[\s,]*")
+
+# Print one progress line per page (disabled with --no-page-log)
+LOG_PAGES = True
+
+# Optimized output (--optimize): binary instead of ASCII85-encoded streams,
+# maximum zlib compression and resource dictionaries shared between pages
+OPTIMIZE_OUTPUT = False
+OPTIMIZED_COMPRESSION_LEVEL = 9
+
+# Largest allowed PDF size per card in bytes (--max-bytes-per-card), None for no limit
+MAX_BYTES_PER_CARD = None
+
+# Reproducible output (--reproducible, or SOURCE_DATE_EPOCH set): identical
+# inputs give byte-identical PDFs. File names get no timestamp and ReportLab's
+# invariant mode fixes the document ID and dates (to SOURCE_DATE_EPOCH if set).
+REPRODUCIBLE = False
+
+# Document information of every PDF (ReportLab writes "untitled"/"anonymous" otherwise)
+PDF_TITLE = "Bitcoin Trivia Cards"
+PDF_ANSWERS_TITLE = "Bitcoin Trivia Cards - Lösungen"
+PDF_AUTHOR = "Bitcoin Trivia"
+PDF_CREATOR = "Bitcoin Trivia Card Generator"
+
+# Question index: positions of every question by difficulty and category,
+# cached on disk per file content so selecting a deck from a large bank does
+# not re-parse the whole file each time. Bump INDEX_VERSION when its format changes.
+INDEX_VERSION = 1
+INDEX_CACHE_DIR = os.path.join(".cache", "card-index")
+
+# Indexes loaded in this process per (path, mtime, size)
+QUESTION_INDEXES = {}
+
+# Card selection for a deck (all fields optional), see select_question_ids;
+# ids are (first, last) ranges as returned by parse_question_ids
+QuestionFilter = namedtuple("QuestionFilter", "difficulties categories ids sample seed per_category")
+
+# Process tracking to avoid duplicates
+PROCESSED_FILES = set()
+
+class BuildMetrics:
+    """Per-stage timings and counters of a build.
+    
+    Timers are exclusive: a stage started inside another one pauses the outer
+    stage, so the stage times add up to the measured total.
+    """
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.stages = {}
+        self.counters = {}
+        self.stack = []
+    
+    @contextlib.contextmanager
+    def timer(self, stage):
+        now = time.perf_counter()
+        if self.stack:
+            outer = self.stack[-1]
+            self.stages[outer[0]] = self.stages.get(outer[0], 0.0) + now - outer[1]
+        self.stack.append([stage, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            stage, started = self.stack.pop()
+            self.stages[stage] = self.stages.get(stage, 0.0) + now - started
+            if self.stack:
+                self.stack[-1][1] = now
+    
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def merge(self, data):
+        """Add the metrics of another process (as returned by as_dict)."""
+        for stage, seconds in data["stages_sec"].items():
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        for name, amount in data["counters"].items():
+            self.count(name, amount)
+    
+    def as_dict(self):
+        data = {"stages_sec": dict(self.stages), "counters": dict(self.counters)}
+        if self.counters.get("pdf_bytes") and self.counters.get("cards"):
+            data["bytes_per_card"] = self.counters["pdf_bytes"] / self.counters["cards"]
+            data["bytes_per_card_by_layout"] = {name[len("pdf_bytes_"):]: amount / self.counters["cards"]
+                                                for name, amount in self.counters.items()
+                                                if name.startswith("pdf_bytes_")}
+        return data
+
+# Metrics of the current process
+METRICS = BuildMetrics()
+
+def log_page(message):
+    """Print a per-page progress message unless page logging is disabled."""
+    if LOG_PAGES:
+        print(message)
+
+def get_timestamp():
+    """Return a timestamp string for filenames."""
+    now = datetime.datetime.now()
+    return now.strftime("%Y%m%d_%H%M%S")
+
+def replace_bitcoin_symbol(text):
+    """Replace the Bitcoin symbol with "BTC" unless the card fonts have a glyph for it."""
+    if NATIVE_BITCOIN_SYMBOL or "₿" not in text:
+        return text
+    return text.replace("₿", "BTC")
+
+def text_width(text, font_name, font_size):
+    """Return the width of text in points, memoized per (font, size, text)."""
+    key = (font_name, font_size, text)
+    width = WIDTH_CACHE.get(key)
+    if width is None:
+        width = pdfmetrics.stringWidth(text, font_name, font_size)
+        WIDTH_CACHE[key] = width
+    return width
+
+def option_prefix(letter, is_answer):
+    """The letter in front of an option: bold in brackets for the correct answer."""
+    return f"[{letter}]" if is_answer else f"{letter}."
+
+def option_text_x(font_size):
+    """X of the option text: OPTION_PREFIX_GAP right of the widest letter prefix, at least OPTION_TEXT_X."""
+    prefix_width = max(max(text_width(option_prefix(letter, True), OPTION_ANSWER_FONT, font_size),
+                           text_width(option_prefix(letter, False), OPTION_FONT, font_size))
+                       for letter in OPTION_LETTERS)
+    return max(OPTION_TEXT_X, OPTION_LETTER_X + prefix_width + OPTION_PREFIX_GAP)
+
+def option_text_width(width, font_size):
+    """Width the option text is wrapped to on a card of the given width."""
+    return width - option_text_x(font_size) - OPTION_RIGHT_PADDING
+
+def wrap_text(text, max_width, font_name, font_size):
+    """Wrap text into lines no wider than max_width points using real font metrics."""
+    space_width = text_width(" ", font_name, font_size)
+    words = text.split()
+    lines = []
+    current_line = ""
+    current_width = 0
+    
+    for word in words:
+        word_width = text_width(word, font_name, font_size)
+        if current_line and current_width + space_width + word_width <= max_width:
+            current_line += " " + word
+            current_width += space_width + word_width
+            continue
+        
+        if current_line:
+            lines.append(current_line)
+        
+        # Break words that are wider than a whole line
+        hyphen_width = text_width("-", font_name, font_size)
+        while word_width > max_width and len(word) > 1:
+            cut = 1
+            while cut < len(word) - 1 and text_width(word[:cut + 1], font_name, font_size) + hyphen_width <= max_width:
+                cut += 1
+            lines.append(word[:cut] + "-")
+            word = word[cut:]
+            word_width = text_width(word, font_name, font_size)
+        
+        current_line = word
+        current_width = word_width
+    
+    if current_line:
+        lines.append(current_line)
+    
+    return lines
+
+def calculate_option_height(lines, font_size):
+    """Calculate the height an option occupies given its wrapped lines."""
+    return max(len(lines) * (font_size + 2), font_size + 5)
+
+def get_category_color(category):
+    """Get the correct color for a category, with language mapping."""
+    # If the category is in the mapping (e.g., German), map it to English first
+    mapped_category = CATEGORY_MAPPING.get(category, category)
+    
+    # Then get the color based on the mapped (or original) category
+    return CATEGORY_COLORS.get(mapped_category, colors.gray)
+
+def load_logo_image(logo_path=LOGO_PATH, size=LOGO_SIZE):
+    """Load the logo once per process, downscaled to print resolution. Returns None if unavailable."""
+    key = (logo_path, size)
+    if key in LOGO_CACHE:
+        return LOGO_CACHE[key]
+    
+    logo_image = None
+    if os.path.exists(logo_path):
+        try:
+            max_pixels = int(size / 72 * LOGO_RENDER_DPI) + 1
+            with PILImage.open(logo_path) as img:
+                img = img.convert("RGBA")
+                img.thumbnail((max_pixels, max_pixels), PILImage.LANCZOS)
+            logo_image = ImageReader(img)
+        except Exception as e:
+            print(f"Fehler beim Laden des Logos: {str(e)}")
+    else:
+        print(f"Logo nicht gefunden unter: {logo_path}")
+    
+    LOGO_CACHE[key] = logo_image
+    return logo_image
+
+def get_logo_form(canvas, width, height):
+    """Return the name of the shared logo form XObject, building it once per canvas."""
+    form_name = f"CardLogo_{int(width)}x{int(height)}"
+    if canvas.hasForm(form_name):
+        return form_name
+    FORM_SPECS[form_name] = ("logo", width, height)
+    
+    canvas.beginForm(form_name, 0, 0, width, height)
+    logo_image = load_logo_image()
+    if logo_image is not None:
+        # Erhält die Proportionen
+        canvas.drawImage(logo_image, width - LOGO_SIZE - 5, height - LOGO_SIZE - 5,
+                        width=LOGO_SIZE, height=LOGO_SIZE, preserveAspectRatio=True, mask='auto')
+    else:
+        # Fallback to Bitcoin symbol if logo can't be loaded
+        canvas.setFillColor(colors.black)
+        canvas.setFont(DIFFICULTY_LABEL_FONT, 14)
+        canvas.drawString(width - 15, height - 15, replace_bitcoin_symbol("₿"))
+    canvas.endForm()
+    return form_name
+
+def get_chrome_form(canvas, width, height, difficulty_color, category_color):
+    """Return the name of the shared header/footer/border form XObject for a color combination."""
+    form_name = (f"CardChrome_{difficulty_color.hexval()[2:]}_{category_color.hexval()[2:]}"
+                 f"_{int(width)}x{int(height)}")
+    if canvas.hasForm(form_name):
+        return form_name
+    FORM_SPECS[form_name] = ("chrome", width, height, difficulty_color, category_color)
+    
+    canvas.beginForm(form_name, 0, 0, width, height)
+    
+    # Draw difficulty header
+    header_height = height / 10
+    canvas.setFillColor(difficulty_color)
+    canvas.rect(0, height - header_height, width, header_height, fill=1, stroke=0)
+    
+    # Draw category footer
+    footer_height = height / 10
+    canvas.setFillColor(category_color)
+    canvas.rect(0, 0, width, footer_height, fill=1, stroke=0)
+    
+    # Draw the card border on top of the colored areas
+    canvas.setStrokeColor(colors.black)
+    canvas.roundRect(0, 0, width, height, 5, fill=0, stroke=1)
+    
+    canvas.endForm()
+    return form_name
+
+def get_bleed_form(canvas, width, height, bleed, difficulty_color, category_color):
+    """Return the name of the form extending a card's header and footer colors into the bleed."""
+    form_name = (f"CardBleed_{difficulty_color.hexval()[2:]}_{category_color.hexval()[2:]}"
+                 f"_{int(width)}x{int(height)}_{int(bleed)}")
+    if canvas.hasForm(form_name):
+        return form_name
+    FORM_SPECS[form_name] = ("bleed", width, height, bleed, difficulty_color, category_color)
+    
+    canvas.beginForm(form_name, -bleed, -bleed, width + bleed, height + bleed)
+    band_height = height / 10
+    canvas.setFillColor(difficulty_color)
+    canvas.rect(-bleed, height - band_height, width + 2 * bleed, band_height + bleed, fill=1, stroke=0)
+    canvas.setFillColor(category_color)
+    canvas.rect(-bleed, -bleed, width + 2 * bleed, band_height + bleed, fill=1, stroke=0)
+    canvas.endForm()
+    return form_name
+
+def question_block_height(lines, font_size):
+    """Height of the question area for the given wrapped lines."""
+    return len(lines) * (font_size + 1) + 10
+
+def options_block_height(option_lines, font_size):
+    """Height needed by all options including the spacing between them."""
+    if not option_lines:
+        return 0
+    return (sum(calculate_option_height(lines, font_size) for lines in option_lines)
+            + OPTION_MIN_SPACING * (len(option_lines) - 1))
+
+def options_available_height(height, question_area_height):
+    """Space left for options between the separator and the footer."""
+    header_height = height / 10
+    footer_height = height / 10
+    separator_y = height - header_height - question_area_height - 10
+    return separator_y - footer_height - 10
+
+def largest_fitting(sizes, fits):
+    """Binary search sizes (largest first) for the first one where fits(size) holds; None if none does."""
+    low, high = 0, len(sizes) - 1
+    found = None
+    while low <= high:
+        mid = (low + high) // 2
+        if fits(sizes[mid]):
+            found = mid
+            high = mid - 1
+        else:
+            low = mid + 1
+    return None if found is None else sizes[found]
+
+def fit_card_text(question_text, options, width, height):
+    """Pick the largest question and option font sizes that fit the card.
+    
+    Wrapped lines are cached per font size so every size is only laid out once
+    during the search. Returns (question_size, question_lines, option_size,
+    option_lines, overflow) where overflow means nothing fits at the minimum sizes.
+    """
+    question_width = width - 2 * QUESTION_PADDING
+    question_cache = {}
+    option_cache = {}
+    
+    def question_lines_at(size):
+        if size not in question_cache:
+            question_cache[size] = wrap_text(question_text, question_width, QUESTION_FONT, size)
+        return question_cache[size]
+    
+    def option_lines_at(size):
+        if size not in option_cache:
+            option_width = option_text_width(width, size)
+            option_cache[size] = [wrap_text(option, option_width, OPTION_FONT, size) for option in options]
+        return option_cache[size]
+    
+    def fits(question_size, option_size):
+        question_height = question_block_height(question_lines_at(question_size), question_size)
+        available_height = options_available_height(height, question_height)
+        return options_block_height(option_lines_at(option_size), option_size) <= available_height
+    
+    # Largest question size that still leaves room for the options at their minimum size,
+    # then the largest option size that fits below that question
+    min_option_size = AUTO_FIT_OPTION_SIZES[-1]
+    question_size = largest_fitting(AUTO_FIT_QUESTION_SIZES, lambda size: fits(size, min_option_size))
+    overflow = question_size is None
+    if overflow:
+        question_size = AUTO_FIT_QUESTION_SIZES[-1]
+        option_size = min_option_size
+    else:
+        option_size = largest_fitting(AUTO_FIT_OPTION_SIZES, lambda size: fits(question_size, size))
+    
+    return question_size, question_lines_at(question_size), option_size, option_lines_at(option_size), overflow
+
+def layout_card(question_data, width, height, auto_fit=False):
+    """Wrap and position all text of a card once; the result is painted by draw_card."""
+    original_difficulty = question_data.get("difficulty", "curious")
+    difficulty = DIFFICULTY_MAPPING.get(original_difficulty, original_difficulty).upper()
+    difficulty_color = DIFFICULTY_COLORS.get(difficulty, colors.white)
+    
+    # Get category and apply language mapping for color selection
+    category = question_data.get("category", "Unknown")
+    category_color = get_category_color(category)
+    
+    header_height = height / 10
+    
+    # Replace Bitcoin symbol to avoid display problems
+    question_text = replace_bitcoin_symbol(question_data.get("question", "Missing question"))
+    
+    # Only the first four options have a letter
+    answer_idx = question_data.get("answer", 0)
+    options = [replace_bitcoin_symbol(option) for option in question_data.get("options", [])[:len(OPTION_LETTERS)]]
+    
+    if auto_fit:
+        question_font_size, question_lines, option_font_size, option_lines, overflow = fit_card_text(
+            question_text, options, width, height)
+        question_area_height = question_block_height(question_lines, question_font_size)
+    else:
+        question_font_size = QUESTION_FONT_SIZE
+        question_lines = wrap_text(question_text, width - 2 * QUESTION_PADDING, QUESTION_FONT, question_font_size)
+        full_question_height = question_block_height(question_lines, question_font_size)
+        question_area_height = min(height / 3, full_question_height)  # Limit question area height
+        available_height = options_available_height(height, question_area_height)
+        
+        # Use the largest option font size whose wrapped options fit
+        for option_font_size in OPTION_FONT_SIZES:
+            option_width = option_text_width(width, option_font_size)
+            option_lines = [wrap_text(option, option_width, OPTION_FONT, option_font_size) for option in options]
+            options_fit = options_block_height(option_lines, option_font_size) <= available_height
+            if options_fit:
+                break
+        overflow = not options_fit or full_question_height > question_area_height
+    
+    separator_y = height - header_height - question_area_height - 10
+    
+    if option_font_size < OPTION_FONT_SIZES[0] or question_font_size < QUESTION_FONT_SIZE:
+        METRICS.count("font_fallbacks")
+    if overflow:
+        METRICS.count("card_overflows")
+    # Words that had to be broken across lines
+    wrapped_words = sum(len(line.split()) for lines in [question_lines] + option_lines for line in lines)
+    original_words = len(question_text.split()) + sum(len(option.split()) for option in options)
+    if wrapped_words > original_words:
+        METRICS.count("wrap_overflows", wrapped_words - original_words)
+    
+    option_layouts = []
+    current_y = separator_y - 15  # Start below separator
+    for i, lines in enumerate(option_lines):
+        # Mark the correct answer with a bold letter in brackets
+        is_answer = i == answer_idx
+        option_layouts.append(OptionLayout(option_prefix(OPTION_LETTERS[i], is_answer), is_answer, lines, current_y,
+                                           options[i]))
+        current_y -= calculate_option_height(lines, option_font_size) + OPTION_MIN_SPACING + 2
+    
+    return CardLayout(
+        difficulty, difficulty_color, category, category_color,
+        question_lines, question_font_size, question_font_size + 1, separator_y,
+        option_font_size, option_layouts, overflow,
+    )
+
+def build_form_from_spec(canvas, spec):
+    """Build a shared form XObject from its FORM_SPECS entry."""
+    kind, args = spec[0], spec[1:]
+    if kind == "chrome":
+        return get_chrome_form(canvas, *args)
+    if kind == "bleed":
+        return get_bleed_form(canvas, *args)
+    return get_logo_form(canvas, *args)
+
+def card_label_runs(layout, width, height):
+    """Return the difficulty and category labels of a card as TextRuns."""
+    header_height = height / 10
+    footer_height = height / 10
+    return [
+        # Difficulty label with more padding
+        TextRun(width / 2, height - header_height / 2 - 4, layout.difficulty, DIFFICULTY_LABEL_FONT, 10, True),
+        # Category label
+        TextRun(width / 2, footer_height / 2 - 3, layout.category, CATEGORY_LABEL_FONT, 7, True),
+    ]
+
+def card_text_runs(layout, width, height):
+    """Return the text of a card as TextRuns in card coordinates (shared by PDF and raster output)."""
+    header_height = height / 10
+    runs = card_label_runs(layout, width, height)
+    
+    # Question with more padding from the sides
+    for i, line in enumerate(layout.question_lines):
+        y_pos = height - header_height - 15 - (i * layout.question_line_height)
+        runs.append(TextRun(width / 2, y_pos, line, QUESTION_FONT, layout.question_font_size, True))
+    
+    # Answer options
+    option_font_size = layout.option_font_size
+    line_spacing = option_font_size + 2
+    text_x = option_text_x(option_font_size)
+    for option in layout.options:
+        runs.append(TextRun(OPTION_LETTER_X, option.y, option.prefix,
+                            OPTION_ANSWER_FONT if option.is_answer else OPTION_FONT, option_font_size, False))
+        
+        # Option text with subsequent lines indented below the first
+        for j, line in enumerate(option.lines):
+            runs.append(TextRun(text_x, option.y - j * line_spacing, line, OPTION_FONT, option_font_size, False))
+    return runs
+
+def answer_text_runs(layout, width, height):
+    """Return the text of a card's answer back: its labels, the answer letter and the answer's wrapped lines."""
+    runs = card_label_runs(layout, width, height)
+    letter_y = height / 2 + 10
+    line_spacing = layout.option_font_size + 2
+    for i, option in enumerate(layout.options):
+        if option.is_answer:
+            runs.append(TextRun(width / 2, letter_y, OPTION_LETTERS[i], OPTION_ANSWER_FONT, ANSWER_LETTER_FONT_SIZE, True))
+            for j, line in enumerate(option.lines):
+                runs.append(TextRun(width / 2, letter_y - 25 - j * line_spacing, line, OPTION_FONT,
+                                    layout.option_font_size, True))
+    return runs
+
+def same_color(current, color):
+    """Return True if the canvas color current (a Color or an RGB tuple) equals color."""
+    if isinstance(current, colors.Color):
+        return current.rgba() == color.rgba()
+    return tuple(current) == color.rgb()
+
+class CardText:
+    """One PDF text object for all strings of a card.
+    
+    drawString/drawCentredString open a text object and set the font for every
+    string; here the font operator is only written when the font changes.
+    """
+    
+    def __init__(self, canvas):
+        self.text_object = canvas.beginText()
+        self.font = None
+    
+    def show(self, x, y, text, font_name, font_size):
+        if self.font != (font_name, font_size):
+            self.text_object.setFont(font_name, font_size)
+            self.font = (font_name, font_size)
+        self.text_object.setTextOrigin(x, y)
+        self.text_object.textOut(text)
+    
+    def centred(self, x, y, text, font_name, font_size):
+        self.show(x - text_width(text, font_name, font_size) / 2, y, text, font_name, font_size)
+
+def draw_text_runs(canvas, runs):
+    """Draw TextRuns in black as one text object."""
+    if not same_color(canvas._fillColorObj, colors.black):
+        canvas.setFillColor(colors.black)
+    text = CardText(canvas)
+    for run in runs:
+        if run.centred:
+            text.centred(run.x, run.y, run.text, run.font_name, run.font_size)
+        else:
+            text.show(run.x, run.y, run.text, run.font_name, run.font_size)
+    canvas.drawText(text.text_object)
+
+def draw_card(canvas, x, y, question_data, width, height, layout=None, auto_fit=False):
+    """Draw a card directly on the canvas at the specified position. Returns the painted layout or None on error."""
+    # Save the canvas state
+    canvas.saveState()
+    
+    try:
+        # Translate to card position
+        canvas.translate(x, y)
+        
+        if layout is None:
+            with METRICS.timer("layout"):
+                layout = layout_card(question_data, width, height, auto_fit)
+        
+        # Stamp the shared header/footer/border and logo forms (built once per canvas)
+        canvas.doForm(get_chrome_form(canvas, width, height, layout.difficulty_color, layout.category_color))
+        canvas.doForm(get_logo_form(canvas, width, height))
+        
+        # Draw a line to separate question from answer options
+        canvas.setStrokeColor(colors.lightgrey)
+        canvas.line(QUESTION_PADDING, layout.separator_y, width - QUESTION_PADDING, layout.separator_y)
+        
+        # All text of the card goes into a single text object
+        draw_text_runs(canvas, card_text_runs(layout, width, height))
+    
+    except Exception as e:
+        print(f"Fehler beim Zeichnen der Karte: {str(e)}")
+        print(f"Frage-Daten: {question_data}")
+        traceback.print_exc()
+        layout = None
+    
+    finally:
+        # Restore the canvas state
+        canvas.restoreState()
+    
+    return layout
+
+def draw_answer_back(canvas, x, y, layout, width, height):
+    """Draw the answer back of a laid-out card at the specified position."""
+    canvas.saveState()
+    try:
+        canvas.translate(x, y)
+        canvas.doForm(get_chrome_form(canvas, width, height, layout.difficulty_color, layout.category_color))
+        draw_text_runs(canvas, answer_text_runs(layout, width, height))
+    finally:
+        canvas.restoreState()
+
+def draw_card_bleed(canvas, x, y, layout, width, height, bleed):
+    """Draw the bleed around a laid-out card at the specified position."""
+    canvas.saveState()
+    try:
+        canvas.translate(x, y)
+        canvas.doForm(get_bleed_form(canvas, width, height, bleed, layout.difficulty_color, layout.category_color))
+    finally:
+        canvas.restoreState()
+
+def card_slots(profile):
+    """Lower left corners of the cards on a sheet of an imposition profile, row by row from the top left."""
+    page_width, page_height = profile.page_size
+    card_width = CARD_WIDTH - SPACING
+    card_height = CARD_HEIGHT - SPACING
+    cell_width = card_width + 2 * profile.bleed + profile.gap
+    cell_height = card_height + 2 * profile.bleed + profile.gap
+    if profile.margin is None:
+        left = (page_width - profile.columns * cell_width) / 2
+        top = (page_height - profile.rows * cell_height) / 2
+    else:
+        left, top = profile.margin
+    return [(left + col * cell_width + (cell_width - card_width) / 2,
+             page_height - top - (row + 1) * cell_height + (cell_height - card_height) / 2)
+            for row in range(profile.rows) for col in range(profile.columns)]
+
+def print_overflow_report(overflow_cards, auto_fit):
+    """Print the cards whose text does not fit on the card."""
+    if not overflow_cards:
+        return
+    
+    print(f"\n=== Überlauf-Bericht: {len(overflow_cards)} Karte(n) passen nicht ===")
+    if auto_fit:
+        print(f"(auch nicht bei Mindestgröße {AUTO_FIT_QUESTION_SIZES[-1]:g}pt/{AUTO_FIT_OPTION_SIZES[-1]:g}pt)")
+    for card_number, question_text in overflow_cards:
+        print(f"  Karte {card_number}: {question_text[:60]}")
+
+
+def iter_questions(json_file, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield the questions of a JSON array one at a time without loading the whole file.
+    
+    Questions are decoded in place at an index into the buffer; the consumed
+    part is only dropped when the next chunk is appended.
+    """
+    decoder = json.JSONDecoder()
+    with open(json_file, 'r', encoding='utf-8') as f:
+        buffer = ""
+        chunk = None
+        while not buffer and chunk != "":
+            chunk = f.read(chunk_size)
+            buffer = chunk.lstrip()
+        eof = False
+        if not buffer.startswith("["):
+            raise ValueError(f"JSON-Datei enthält kein Array: {json_file}")
+        position = 1
+        
+        while True:
+            position = ARRAY_SEPARATORS.match(buffer, position).end()
+            if position < len(buffer):
+                if buffer[position] == "]":
+                    return
+                try:
+                    question, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    # The object continues in the next chunk
+                    if eof:
+                        raise
+                else:
+                    position = end
+                    yield question
+                    continue
+            elif eof:
+                raise ValueError(f"Unerwartetes Dateiende in: {json_file}")
+            
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+def iter_pages(questions, cards_per_page=CARDS_PER_PAGE):
+    """Group an iterable of questions into lists of one page each."""
+    page = []
+    for question in questions:
+        page.append(question)
+        if len(page) == cards_per_page:
+            yield page
+            page = []
+    if page:
+        yield page
+
+def timed_pages(pages):
+    """Yield pages, timing how long reading each one takes as the "load" stage."""
+    pages = iter(pages)
+    while True:
+        with METRICS.timer("load"):
+            page_questions = next(pages, None)
+        if page_questions is None:
+            return
+        yield page_questions
+
+def draw_page(c, page_questions, first_card_number, auto_fit=False):
+    """Draw one page of cards in the default 3x3 grid. Returns (card_number, question) of cards that overflow."""
+    overflow_cards = []
+    slots = card_slots(IMPOSITION_PROFILES[DEFAULT_IMPOSITION])
+    for rel_idx, question_data in enumerate(page_questions):
+        x, y = slots[rel_idx]
+        
+        # Draw the card
+        with METRICS.timer("draw"):
+            layout = draw_card(
+                c, 
+                x, 
+                y, 
+                question_data, 
+                CARD_WIDTH - SPACING, 
+                CARD_HEIGHT - SPACING,
+                auto_fit=auto_fit
+            )
+        METRICS.count("cards")
+        if layout is not None and layout.overflow:
+            overflow_cards.append((first_card_number + rel_idx, question_data.get("question", "")))
+    return overflow_cards
+
+def register_deck_fonts(c):
+    """Register the deck fonts in a fixed order so internal font names are the same on every canvas.
+    
+    TrueType fonts get their names when their first subset is used, so they are skipped.
+    """
+    for font_name in DECK_FONTS:
+        if not pdfmetrics.getFont(font_name)._dynamicFont:
+            c._doc.getInternalFontName(font_name)
+
+def deck_canvas(output, page_size=A4, title=PDF_TITLE):
+    """Create the canvas of an output PDF with the fixed document information and the deck fonts registered."""
+    c = canvas.Canvas(output, pagesize=page_size, pageCompression=1, invariant=1 if REPRODUCIBLE else None)
+    c.setTitle(title)
+    c.setAuthor(PDF_AUTHOR)
+    c.setCreator(PDF_CREATOR)
+    register_deck_fonts(c)
+    return c
+
+def compression_level():
+    """zlib level for page content compressed by the generator itself."""
+    return OPTIMIZED_COMPRESSION_LEVEL if OPTIMIZE_OUTPUT else zlib.Z_DEFAULT_COMPRESSION
+
+@contextlib.contextmanager
+def pdf_output_settings():
+    """Apply the ReportLab settings of the current output mode while a deck is drawn and saved."""
+    use_a85 = rl_config.useA85
+    if OPTIMIZE_OUTPUT:
+        rl_config.useA85 = 0
+    try:
+        yield
+    finally:
+        rl_config.useA85 = use_a85
+
+def compressed_stream(content):
+    """Wrap already compressed page content in a FlateDecode PDF stream."""
+    return PDFStream(PDFDictionary({"Filter": PDFArray([PDFName("FlateDecode")])}), content)
+
+class SpooledStream(PDFStream):
+    """Compressed page content kept in a spool file and read back only while the PDF is written."""
+    
+    def __init__(self, spool, offset, length):
+        PDFStream.__init__(self, PDFDictionary({"Filter": PDFArray([PDFName("FlateDecode")])}))
+        self.spool = spool
+        self.offset = offset
+        self.length = length
+    
+    def format(self, document):
+        self.spool.seek(self.offset)
+        self.content = self.spool.read(self.length)
+        try:
+            return PDFStream.format(self, document)
+        finally:
+            self.content = None
+
+def spool_stream(spool, content):
+    """Append compressed content to a spool file and return a SpooledStream for it."""
+    spool.seek(0, os.SEEK_END)
+    offset = spool.tell()
+    spool.write(content)
+    return SpooledStream(spool, offset, len(content))
+
+class StreamingPDFFile(PDFFile):
+    """A PDFFile that writes every object to output as soon as it is added."""
+    
+    def __init__(self, output, pdfVersion=pdfdoc.PDF_VERSION_DEFAULT):
+        PDFFile.__init__(self, pdfVersion)
+        output.write(b"".join(self.strings))   # The header, already counted in the offsets
+        self.strings = []
+        self.write = output.write
+
+def format_incrementally(document, output):
+    """PDFDocument.format() writing each object to output instead of collecting the whole file.
+    
+    Follows PDFDocument.format of the pinned reportlab version object by object,
+    so the bytes written are the same.
+    """
+    document.encrypt.prepare(document)
+    document.Reference(document.Catalog)
+    document.Reference(document.info)
+    encrypt_info = document.encrypt.info()
+    encrypt_ref = document.Reference(encrypt_info) if encrypt_info else None
+    
+    # Objects get referenced while earlier ones are formatted, so numberToId grows during the loop
+    document.__accum__ = pdf_file = StreamingPDFFile(output, document._pdfVersion)
+    ids = []
+    number = 1
+    while number in document.numberToId:
+        oid = document.numberToId[number]
+        obj = document.idToObject[oid]
+        formatted = pdfdoc.PDFIndirectObject(oid, obj).format(document)
+        if not rl_config.invariant and rl_config.pdfComments:
+            pdf_file.add("%% %s: class %s \n" % (ascii(oid), obj.__class__.__name__[:50]))
+        document.idToOffset[oid] = pdf_file.add(formatted)
+        ids.append(oid)
+        number += 1
+    del document.__accum__
+    
+    xref = pdfdoc.PDFCrossReferenceTable()
+    xref.addsection(0, ids)
+    xref_offset = pdf_file.add(xref.format(document))
+    trailer = pdfdoc.PDFTrailer(startxref=xref_offset, Size=len(ids) + 1, Root=document.Reference(document.Catalog),
+                                Info=document.Reference(document.info), Encrypt=encrypt_ref, ID=document.ID())
+    pdf_file.add(trailer.format(document))
+    return b""
+
+def save_incrementally(c, output):
+    """Save the canvas without holding the formatted PDF in memory (output is a path or a file)."""
+    f = open(output, 'wb') if isinstance(output, str) else output
+    try:
+        # GetPDFData prepares fonts, info and outlines and then calls format(), here only for this document
+        c._doc.format = lambda: format_incrementally(c._doc, f)
+        c.getpdfdata()
+    finally:
+        if f is not output:
+            f.close()
+
+def show_page(c):
+    """Finish the current page."""
+    with METRICS.timer("page"):
+        c.showPage()
+    METRICS.count("pages")
+
+def flush_page(c, shared_resources, spool):
+    """Compact the page just finished so none of its content stays in memory.
+    
+    ReportLab keeps every page's uncompressed operator string and its own
+    resource dictionaries until save(). The content is compressed into the
+    spool file (see SpooledStream) and identical XObject dictionaries are
+    shared between pages (shared_resources is a dict owned by the caller).
+    """
+    with METRICS.timer("flush"):
+        page = c._doc.Pages.pages[-1]
+        stream = page.stream
+        if stream:
+            if not isinstance(stream, bytes):
+                stream = stream.encode("utf-8")
+            page.Contents = spool_stream(spool, zlib.compress(stream, compression_level()))
+            page.stream = None
+        
+        if page.XObjects is not None:
+            key = tuple(sorted(page.XObjects.dict))
+            page.XObjects = shared_resources.setdefault(key, page.XObjects)
+
+def render_shard(shard_pages, first_card_number, auto_fit=False, settings=None):
+    """Render a range of pages on a scratch canvas; runs in a worker process.
+    
+    settings comes from process_settings() in the parent; without it the
+    module settings are used as they are. Returns (rendered_pages, form_specs,
+    overflow_cards, metrics). Each rendered page is (compressed_content,
+    form_names) and form_specs describes every form used.
+    """
+    if settings is not None:
+        apply_process_settings(settings)
+    METRICS.reset()
+    c = canvas.Canvas(io.BytesIO(), pagesize=A4)
+    register_deck_fonts(c)
+    overflow_cards = []
+    card_number = first_card_number
+    
+    for page_questions in shard_pages:
+        overflow_cards.extend(draw_page(c, page_questions, card_number, auto_fit))
+        card_number += len(page_questions)
+        show_page(c)
+    
+    rendered_pages = []
+    used_forms = set()
+    with METRICS.timer("flush"):
+        for page in c._doc.Pages.pages:
+            page_xobjects = page.XObjects.dict if page.XObjects is not None else {}
+            form_names = sorted(name for name in FORM_SPECS if xObjectName(name) in page_xobjects)
+            used_forms.update(form_names)
+            rendered_pages.append((zlib.compress(page.stream.encode("utf-8"), compression_level()), form_names))
+    
+    # In the order they were built, so the merge adds them to the document like a serial build
+    build_order = {key: number for number, key in enumerate(c._doc.idToObject)}
+    form_specs = {name: FORM_SPECS[name] for name in sorted(used_forms, key=lambda name: build_order[xObjectName(name)])}
+    return rendered_pages, form_specs, overflow_cards, METRICS.as_dict()
+
+def add_rendered_page(c, content, form_names, shared_resources, spool=None):
+    """Append a page rendered by render_shard to the canvas, sharing its forms and fonts.
+    
+    The content goes to the spool file if one is given and stays in memory otherwise.
+    """
+    c.showPage()
+    page = c._doc.Pages.pages[-1]
+    page.Contents = compressed_stream(content) if spool is None else spool_stream(spool, content)
+    page.stream = None
+    key = tuple(xObjectName(name) for name in form_names)
+    if key:
+        page.XObjects = shared_resources.setdefault(key, c._doc.xobjDict(form_names))
+
+def draw_pages_sharded(c, pages, page_jobs, spool, auto_fit=False):
+    """Render pages in worker processes and merge them into c in page order.
+    
+    Pages are handed out in shards of SHARD_PAGES; at most two shards per
+    worker are in flight so a streamed question source stays bounded, and
+    the merged page content goes to the spool file.
+    Returns (overflow_cards, card_count, page_count).
+    """
+    overflow_cards = []
+    shared_resources = {}
+    card_count = 0
+    page_count = 0
+    pending = []
+    
+    def merge_next():
+        nonlocal page_count
+        rendered_pages, form_specs, shard_overflow, shard_metrics = pending.pop(0).result()
+        with METRICS.timer("merge"):
+            for content, form_names in rendered_pages:
+                # Forms are built before the first page using them, as a serial build does
+                for name, spec in form_specs.items():
+                    if name in form_names:
+                        build_form_from_spec(c, spec)
+                add_rendered_page(c, content, form_names, shared_resources, spool)
+        METRICS.merge(shard_metrics)
+        overflow_cards.extend(shard_overflow)
+        page_count += len(rendered_pages)
+        log_page(f"Seiten bis {page_count} zusammengeführt")
+    
+    settings = process_settings()
+    with ProcessPoolExecutor(max_workers=page_jobs) as executor:
+        shard = []
+        shard_first_card = 1
+        for page_questions in timed_pages(pages):
+            shard.append(page_questions)
+            card_count += len(page_questions)
+            if len(shard) == SHARD_PAGES:
+                pending.append(executor.submit(render_shard, shard, shard_first_card, auto_fit, settings))
+                shard_first_card = card_count + 1
+                shard = []
+                if len(pending) >= 2 * page_jobs:
+                    merge_next()
+        if shard:
+            pending.append(executor.submit(render_shard, shard, shard_first_card, auto_fit, settings))
+        while pending:
+            merge_next()
+    
+    return overflow_cards, card_count, page_count
+
+class ImposedDeck:
+    """The PDF of a deck in one imposition profile, filled one laid-out card at a time.
+    
+    Cards are collected until a sheet is full; the sheet is then painted,
+    followed by its answer back if the profile has one. With flush=True every
+    finished page is compacted with flush_page and the PDF is written with
+    save_incrementally.
+    """
+    
+    def __init__(self, profile, output, flush=False):
+        self.profile = profile
+        self.output = output
+        self.flush = flush
+        self.card_width = CARD_WIDTH - SPACING
+        self.card_height = CARD_HEIGHT - SPACING
+        self.slots = card_slots(profile)
+        self.sheet = []             # (question_data, layout) of the cards on the current sheet
+        self.shared_resources = {}
+        self.spool = tempfile.TemporaryFile() if flush else None
+        self.canvas = deck_canvas(output, profile.page_size)
+        if profile.bleed and len(self.slots) == 1:
+            x, y = self.slots[0]
+            self.canvas.setTrimBox((x, y, x + self.card_width, y + self.card_height))
+            self.canvas.setBleedBox((0, 0) + tuple(profile.page_size))
+    
+    def add(self, question_data, layout):
+        """Place a card (layout is None for a card that could not be laid out; its slot stays empty)."""
+        self.sheet.append((question_data, layout))
+        if len(self.sheet) == len(self.slots):
+            self.finish_sheet()
+    
+    def finish_sheet(self):
+        c = self.canvas
+        cards = [(slot, question_data, layout)
+                 for slot, (question_data, layout) in zip(self.slots, self.sheet) if layout is not None]
+        for (x, y), question_data, layout in cards:
+            with METRICS.timer("draw"):
+                if self.profile.bleed:
+                    draw_card_bleed(c, x, y, layout, self.card_width, self.card_height, self.profile.bleed)
+                draw_card(c, x, y, question_data, self.card_width, self.card_height, layout=layout)
+        self.show_sheet()
+        
+        if self.profile.answer_backs:
+            # Mirrored horizontally so every back lands behind its front
+            page_width = self.profile.page_size[0]
+            for (x, y), question_data, layout in cards:
+                with METRICS.timer("draw"):
+                    back_x = page_width - x - self.card_width
+                    if self.profile.bleed:
+                        draw_card_bleed(c, back_x, y, layout, self.card_width, self.card_height, self.profile.bleed)
+                    draw_answer_back(c, back_x, y, layout, self.card_width, self.card_height)
+            self.show_sheet()
+        self.sheet = []
+    
+    def show_sheet(self):
+        show_page(self.canvas)
+        if self.flush:
+            flush_page(self.canvas, self.shared_resources, self.spool)
+    
+    def save(self):
+        """Paint the last, partly filled sheet and write the PDF. Returns its size in bytes."""
+        if self.sheet:
+            self.finish_sheet()
+        with METRICS.timer("save"):
+            if self.flush:
+                save_incrementally(self.canvas, self.output)
+                self.spool.close()
+            else:
+                self.canvas.save()
+        return os.path.getsize(self.output) if isinstance(self.output, str) else self.output.tell()
+
+class AnswerSheet:
+    """Answer sheet of a deck: a dense table with card number, difficulty and correct answer.
+    
+    Rows are added from the card layouts while the decks are rendered, so the
+    questions are not read or wrapped again; answer widths are taken from the
+    word widths measured during layout. The sheet is printed in the card fonts
+    (Helvetica or --font), all rows of a page in one text object.
+    Pages are written as they fill (and compacted with flush_page when flush is set,
+    like ImposedDeck).
+    """
+    
+    def __init__(self, output, flush=False):
+        self.output = output
+        self.flush = flush
+        self.block_width = (A4_WIDTH - 2 * MARGIN - (ANSWER_SHEET_BLOCKS - 1) * SPACING) / ANSWER_SHEET_BLOCKS
+        self.rows_per_block = int((A4_HEIGHT - 2 * MARGIN) // ANSWER_ROW_HEIGHT)
+        self.font = OPTION_FONT
+        self.bold_font = OPTION_ANSWER_FONT
+        self.row = 0                # Row on the current page, counted across its blocks
+        self.text = None            # CardText of the current page
+        self.shared_resources = {}
+        self.spool = tempfile.TemporaryFile() if flush else None
+        self.canvas = deck_canvas(output, title=PDF_ANSWERS_TITLE)
+    
+    def add(self, card_number, layout):
+        """Add the row of a card (layout is None for a card that could not be laid out)."""
+        with METRICS.timer("answers"):
+            block, row = divmod(self.row, self.rows_per_block)
+            x = MARGIN + block * (self.block_width + SPACING)
+            y = A4_HEIGHT - MARGIN - (row + 1) * ANSWER_ROW_HEIGHT + 2
+            number_x, difficulty_x, letter_x, answer_x = ANSWER_COLUMNS
+            if self.text is None:
+                self.text = CardText(self.canvas)
+            
+            # In the regular font except for the answer letter, the number right aligned
+            number = str(card_number)
+            self.text.show(x + number_x - text_width(number, self.font, ANSWER_FONT_SIZE), y, number,
+                           self.font, ANSWER_FONT_SIZE)
+            if layout is not None:
+                self.text.show(x + difficulty_x, y, layout.difficulty, self.font, ANSWER_FONT_SIZE)
+                for i, option in enumerate(layout.options):
+                    if option.is_answer:
+                        self.text.show(x + letter_x, y, OPTION_LETTERS[i], self.bold_font, ANSWER_FONT_SIZE)
+                        self.text.show(x + answer_x, y, self.answer_text(option, layout.option_font_size),
+                                       self.font, ANSWER_FONT_SIZE)
+            
+            self.row += 1
+            if self.row == self.rows_per_block * ANSWER_SHEET_BLOCKS:
+                self.finish_page()
+    
+    def answer_text(self, option, option_font_size):
+        """The option's text on one line, shortened with an ellipsis to the answer column."""
+        # The sheet uses the option font, so the widths cached while wrapping the option
+        # are reused, scaled from its font size
+        words = option.text.split()
+        max_width = self.block_width - ANSWER_COLUMNS[3]
+        scale = ANSWER_FONT_SIZE / option_font_size
+        space_width = text_width(" ", self.font, option_font_size) * scale
+        widths = [text_width(word, self.font, option_font_size) * scale for word in words]
+        if sum(widths) + space_width * (len(words) - 1) <= max_width:
+            return " ".join(words)
+        
+        # Keep the words that fit in front of the ellipsis
+        used = text_width("…", self.font, ANSWER_FONT_SIZE)
+        kept = []
+        for word, width in zip(words, widths):
+            width += space_width if kept else 0
+            if used + width > max_width:
+                break
+            used += width
+            kept.append(word)
+        if not kept:
+            return truncate_text(words[0], max_width, self.font, ANSWER_FONT_SIZE)
+        return " ".join(kept) + "…"
+    
+    def finish_page(self):
+        self.canvas.drawText(self.text.text_object)
+        self.canvas.showPage()
+        if self.flush:
+            flush_page(self.canvas, self.shared_resources, self.spool)
+        self.text = None
+        self.row = 0
+    
+    def save(self):
+        """Write the last page and the PDF."""
+        with METRICS.timer("answers"):
+            if self.row:
+                self.finish_page()
+            if self.flush:
+                save_incrementally(self.canvas, self.output)
+                self.spool.close()
+            else:
+                self.canvas.save()
+
+def truncate_text(text, max_width, font_name, font_size):
+    """Shorten text with an ellipsis so it is no wider than max_width points."""
+    if pdfmetrics.stringWidth(text, font_name, font_size) <= max_width:
+        return text
+    while text and pdfmetrics.stringWidth(text + "…", font_name, font_size) > max_width:
+        text = text[:-1]
+    return text.rstrip() + "…"
+
+def layout_deck_card(question_data, auto_fit=False):
+    """Lay out a card at the trim size of every imposition profile. Returns None on error."""
+    try:
+        with METRICS.timer("layout"):
+            return layout_card(question_data, CARD_WIDTH - SPACING, CARD_HEIGHT - SPACING, auto_fit)
+    except Exception as e:
+        print(f"Fehler beim Berechnen der Karte: {str(e)}")
+        print(f"Frage-Daten: {question_data}")
+        traceback.print_exc()
+        return None
+
+def render_cards(questions, outputs, auto_fit=False, stream=False, page_jobs=1, answers_output=None):
+    """Draw the questions as card decks and save them.
+    
+    outputs maps an imposition profile name to a file name or binary file
+    object. Every card is laid out once and painted into each profile, and
+    into the answer sheet written to answers_output if one is given.
+    Returns (card_count, overflow_cards); nothing is saved when there are no cards.
+    """
+    with pdf_output_settings():
+        overflow_cards = []
+        card_count = 0
+        
+        if page_jobs > 1 and list(outputs) == [DEFAULT_IMPOSITION] and answers_output is None and not CARD_FONT_FILES:
+            # Wir verwenden einen direkten Canvas-Ansatz
+            output = outputs[DEFAULT_IMPOSITION]
+            c = deck_canvas(output)
+            print(f"Rendere Seiten parallel mit {page_jobs} Prozessen...")
+            with tempfile.TemporaryFile() as spool:
+                overflow_cards, card_count, _ = draw_pages_sharded(c, iter_pages(questions), page_jobs, spool, auto_fit)
+                if card_count:
+                    # Save the PDF
+                    with METRICS.timer("save"):
+                        save_incrementally(c, output)
+            if card_count:
+                count_pdf_bytes(DEFAULT_IMPOSITION, os.path.getsize(output) if isinstance(output, str) else output.tell())
+            return card_count, overflow_cards
+        
+        if page_jobs > 1:
+            # Font subsets are numbered per document, so pages with an embedded font cannot be merged
+            print("Hinweis: --page-jobs unterstützt nur das Standard-Drucklayout ohne Lösungsblatt und ohne --font, "
+                  "Seiten werden im Hauptprozess gerendert.")
+        decks = [ImposedDeck(IMPOSITION_PROFILES[name], output, stream or OPTIMIZE_OUTPUT)
+                 for name, output in outputs.items()]
+        answer_sheet = AnswerSheet(answers_output, stream or OPTIMIZE_OUTPUT) if answers_output else None
+        
+        # Progress is logged per 9 cards (one page of the default layout)
+        total_pages = None if stream else (len(questions) + CARDS_PER_PAGE - 1) // CARDS_PER_PAGE
+        for page, page_questions in enumerate(timed_pages(iter_pages(questions))):
+            if total_pages is None:
+                log_page(f"Erstelle Seite {page+1}")
+            else:
+                log_page(f"Erstelle Seite {page+1} von {total_pages}")
+            
+            for question_data in page_questions:
+                card_count += 1
+                layout = layout_deck_card(question_data, auto_fit)
+                METRICS.count("cards")
+                if layout is not None and layout.overflow:
+                    overflow_cards.append((card_count, question_data.get("question", "")))
+                for deck in decks:
+                    deck.add(question_data, layout)
+                if answer_sheet is not None:
+                    answer_sheet.add(card_count, layout)
+        
+        if card_count:
+            for i, (name, deck) in enumerate(zip(outputs, decks)):
+                count_pdf_bytes(name, deck.save(), first=i == 0)
+            if answer_sheet is not None:
+                answer_sheet.save()
+    return card_count, overflow_cards
+
+def count_pdf_bytes(imposition, pdf_bytes, first=True):
+    """Record the size of a saved deck as pdf_bytes_<imposition>.
+    
+    pdf_bytes (and with it bytes_per_card) only counts the first layout of a
+    build, so it is the size of one file per deck, like check_size_budget.
+    """
+    METRICS.count(f"pdf_bytes_{imposition}", pdf_bytes)
+    if first:
+        METRICS.count("pdf_bytes", pdf_bytes)
+
+def imposition_outputs(output_pdf):
+    """Map each profile in IMPOSITIONS to its output file: the default layout keeps the name, others get a suffix."""
+    base_name, extension = os.path.splitext(output_pdf)
+    return {name: output_pdf if name == DEFAULT_IMPOSITION else f"{base_name}_{name}{extension}"
+            for name in IMPOSITIONS}
+
+def answer_sheet_output(output_pdf):
+    """Return the file name of the answer sheet that belongs to a deck."""
+    base_name, extension = os.path.splitext(output_pdf)
+    return f"{base_name}_answers{extension}"
+
+def over_budget_name(output_pdf):
+    """Return the name a deck over MAX_BYTES_PER_CARD is moved to: <name>.overbudget.pdf."""
+    base_name, extension = os.path.splitext(output_pdf)
+    return f"{base_name}.overbudget{extension}"
+
+def report_no_cards(question_filter):
+    """Print why a deck has no cards; an empty selection is counted, so main does not fall back to all files."""
+    if question_filter is None:
+        print("Fehler: Keine Fragen in der JSON-Datei gefunden.")
+    else:
+        print("Fehler: Keine Karten ausgewählt, die Auswahloptionen passen auf keine Frage.")
+        METRICS.count("empty_selections")
+
+def check_size_budget(pdf_bytes, card_count):
+    """Print the PDF size per card. Returns False if it exceeds MAX_BYTES_PER_CARD."""
+    bytes_per_card = pdf_bytes / card_count
+    print(f"PDF-Größe: {pdf_bytes} Bytes, {bytes_per_card:.0f} Bytes pro Karte")
+    if MAX_BYTES_PER_CARD is not None and bytes_per_card > MAX_BYTES_PER_CARD:
+        print(f"FEHLER: {bytes_per_card:.0f} Bytes pro Karte überschreiten das Budget von {MAX_BYTES_PER_CARD} Bytes")
+        METRICS.count("size_budget_exceeded")
+        return False
+    return True
+
+def create_trivia_cards(json_file, output_pdf, auto_fit=False, add_timestamp=True, stream=False, page_jobs=1,
+                        question_filter=None, create_answers=False):
+    """Create a PDF with trivia cards from the JSON data (or a compiled bank). Returns (success, first output PDF)."""
+    
+    # Normalisiere die Pfade für konsistente Speicherung im Set
+    json_file = os.path.normpath(json_file)
+    
+    # Check if we already processed this file to avoid duplicates
+    file_key = f"{json_file}"  # Use just the JSON file path as key
+    if file_key in PROCESSED_FILES:
+        print(f"Überspringe bereits verarbeitete Datei: {json_file}")
+        return True, output_pdf
+    
+    PROCESSED_FILES.add(file_key)
+    
+    # Add timestamp to filename (incremental builds pass a content-addressed name instead)
+    if add_timestamp and not REPRODUCIBLE:
+        timestamp = get_timestamp()
+        base_name, extension = os.path.splitext(output_pdf)
+        output_pdf_with_timestamp = f"{base_name}_{timestamp}{extension}"
+    else:
+        output_pdf_with_timestamp = output_pdf
+    
+    # Load the question data
+    try:
+        print(f"Versuche JSON-Datei zu lesen: {json_file}")
+        
+        # Überprüfen, ob die Datei existiert
+        if not os.path.exists(json_file):
+            print(f"FEHLER: JSON-Datei nicht gefunden: {json_file}")
+            print(f"Aktuelles Verzeichnis: {os.getcwd()}")
+            print(f"Verfügbare Dateien im Ordner: {os.listdir(os.path.dirname(json_file) if os.path.dirname(json_file) else '.')}")
+            return False, None
+        
+        if question_filter is not None:
+            questions = select_questions(json_file, question_filter, stream)
+        elif is_bank_file(json_file):
+            # Memory-mapped, questions are decoded while they are drawn (also for --stream)
+            with METRICS.timer("load"):
+                questions = QuestionBank(json_file)
+            print(f"Fragenbank geöffnet: {len(questions)} Fragen.")
+        elif stream:
+            questions = iter_questions(json_file)
+            print("JSON wird seitenweise gelesen (Streaming-Modus).")
+        else:
+            with METRICS.timer("load"):
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    questions = json.load(f)
+            print(f"JSON erfolgreich geladen: {len(questions)} Fragen gefunden.")
+    except Exception as e:
+        print(f"Fehler beim Laden der JSON-Datei: {str(e)}")
+        traceback.print_exc()
+        return False, None
+    
+    if not stream and not questions:
+        report_no_cards(question_filter)
+        return False, None
+    
+    # Set up the PDF document
+    try:
+        outputs = imposition_outputs(output_pdf_with_timestamp)
+        answers_output = answer_sheet_output(output_pdf_with_timestamp) if create_answers else None
+        for output in outputs.values():
+            print(f"Erstelle PDF-Dokument: {output}")
+        
+        card_count, overflow_cards = render_cards(questions, outputs, auto_fit, stream, page_jobs, answers_output)
+        if card_count == 0:
+            # Streamed decks only know they are empty after rendering
+            for output in list(outputs.values()) + [answers_output]:
+                if output and os.path.exists(output):
+                    os.remove(output)
+            report_no_cards(question_filter)
+            return False, None
+        
+        for output in outputs.values():
+            print(f"Trivia-Karten PDF erstellt: {output}")
+        if answers_output:
+            print(f"Lösungsblatt erstellt: {answers_output}")
+        print_overflow_report(overflow_cards, auto_fit)
+        over_budget = [output for output in outputs.values()
+                       if not check_size_budget(os.path.getsize(output), card_count)]
+        if over_budget:
+            # Kept for inspection, but not under the name a finished deck has
+            for output in over_budget:
+                os.replace(output, over_budget_name(output))
+                print(f"Zu große PDF umbenannt: {over_budget_name(output)}")
+            return False, None
+        return True, next(iter(outputs.values()))
+    
+    except Exception as e:
+        print(f"Fehler beim Erstellen des PDFs: {str(e)}")
+        traceback.print_exc()
+        return False, None
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def layout_settings():
+    """Return the layout constants a rendered deck depends on."""
+    settings = {
+        "card": [A4_WIDTH, A4_HEIGHT, MARGIN, CARD_WIDTH, CARD_HEIGHT, SPACING, CARDS_PER_PAGE, CARDS_PER_ROW],
+        "logo": [LOGO_SIZE, LOGO_RENDER_DPI],
+        "question": [QUESTION_FONT, QUESTION_FONT_SIZE, QUESTION_PADDING],
+        "options": [OPTION_FONT, OPTION_ANSWER_FONT, list(OPTION_FONT_SIZES), OPTION_LETTER_X,
+                    OPTION_TEXT_X, OPTION_PREFIX_GAP, OPTION_RIGHT_PADDING, OPTION_MIN_SPACING, OPTION_LETTERS],
+        "auto_fit": [list(AUTO_FIT_QUESTION_SIZES), list(AUTO_FIT_OPTION_SIZES)],
+        "difficulties": DIFFICULTY_MAPPING,
+        "difficulty_colors": {name: color.hexval() for name, color in DIFFICULTY_COLORS.items()},
+        "category_colors": {name: color.hexval() for name, color in CATEGORY_COLORS.items()},
+        "categories": CATEGORY_MAPPING,
+        "optimize": OPTIMIZE_OUTPUT,
+    }
+    if CARD_FONT_FILES:
+        settings["font_files"] = [file_digest(path) for path in CARD_FONT_FILES if path]
+    return settings
+
+def build_inputs(json_file, auto_fit=False, stream=False, question_filter=None, create_answers=False):
+    """Collect the content hashes a deck depends on and the combined build digest."""
+    settings = json.dumps(layout_settings(), sort_keys=True)
+    inputs = {
+        "manifest_version": MANIFEST_VERSION,
+        "questions": file_digest(json_file),
+        "logo": file_digest(LOGO_PATH),
+        "layout": hashlib.sha256(settings.encode("utf-8")).hexdigest(),
+        "auto_fit": auto_fit,
+        "stream": stream,
+        "filter": question_filter._asdict() if question_filter else None,
+        "impositions": {name: IMPOSITION_PROFILES[name] for name in IMPOSITIONS},
+        "answers": create_answers,
+        "reproducible": REPRODUCIBLE,
+    }
+    digest = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+    return digest, inputs
+
+def load_build_manifest(manifest_path):
+    """Load the incremental build manifest, or return an empty one."""
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+            print(f"Build-Manifest hat eine andere Version, wird neu aufgebaut: {manifest_path}")
+        except Exception as e:
+            print(f"Fehler beim Laden des Build-Manifests: {str(e)}")
+    return {"version": MANIFEST_VERSION, "builds": {}}
+
+def save_build_manifest(manifest, manifest_path):
+    """Write the incremental build manifest."""
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def plan_incremental_build(manifest, json_file, output_pdf, auto_fit=False, stream=False, question_filter=None,
+                           create_answers=False):
+    """Decide whether a deck needs rebuilding.
+    
+    Returns (up_to_date, target_pdf, entry) where target_pdf is the stable
+    content-addressed output name and entry is the manifest record to store
+    once the build succeeded.
+    """
+    digest, inputs = build_inputs(json_file, auto_fit, stream, question_filter, create_answers)
+    base_name, extension = os.path.splitext(output_pdf)
+    target_pdf = f"{base_name}_{digest[:12]}{extension}"
+    outputs = list(imposition_outputs(target_pdf).values())
+    if create_answers:
+        outputs.append(answer_sheet_output(target_pdf))
+    entry = {"source": os.path.normpath(json_file), "digest": digest, "inputs": inputs, "output": outputs[0],
+             "outputs": outputs}
+    
+    previous = manifest["builds"].get(output_pdf)
+    up_to_date = (previous is not None and previous.get("digest") == digest
+                  and all(os.path.exists(path) for path in outputs))
+    return up_to_date, target_pdf, entry
+
+def record_incremental_build(manifest, output_pdf, entry):
+    """Store a finished build in the manifest and remove the output it replaces."""
+    previous = manifest["builds"].get(output_pdf)
+    if previous:
+        for path in previous.get("outputs", [previous.get("output", "")]):
+            if path not in entry["outputs"] and os.path.exists(path):
+                print(f"Entferne veraltete Ausgabe: {path}")
+                os.remove(path)
+    manifest["builds"][output_pdf] = entry
+
+def create_trivia_cards_incremental(json_file, output_pdf, auto_fit=False, manifest_path=DEFAULT_MANIFEST_PATH,
+                                    stream=False, page_jobs=1, question_filter=None, create_answers=False):
+    """Build a single deck only if its inputs changed since the last recorded build."""
+    manifest = load_build_manifest(manifest_path)
+    up_to_date, target_pdf, entry = plan_incremental_build(manifest, json_file, output_pdf, auto_fit, stream,
+                                                           question_filter, create_answers)
+    if up_to_date:
+        print(f"Unverändert, überspringe: {entry['output']}")
+        return True, entry['output']
+    
+    success, result_pdf = create_trivia_cards(json_file, target_pdf, auto_fit, add_timestamp=False, stream=stream,
+                                              page_jobs=page_jobs, question_filter=question_filter,
+                                              create_answers=create_answers)
+    if success:
+        record_incremental_build(manifest, output_pdf, entry)
+        save_build_manifest(manifest, manifest_path)
+    return success, result_pdf
+
+
+def font_cache_key():
+    """Version stamp of cached font tables, which are read by ReportLab's TrueType code."""
+    return [FONT_CACHE_VERSION, reportlab.Version]
+
+class CardFontFace(TTFontFace):
+    """A TrueType face whose character tables can come from the font cache.
+    
+    With cached_tables (as returned by font_tables) only the header tables of
+    the file are parsed; the per-character cmap, width and glyph location
+    tables, which take long to read for large Unicode fonts, are taken from them.
+    Subsets are cached per font file digest, in memory and in FONT_CACHE_DIR.
+    """
+    
+    def __init__(self, filename, digest, cached_tables=None):
+        self.digest = digest
+        self.cached_tables = cached_tables
+        TTFontFace.__init__(self, filename)
+        self.cached_tables = None
+    
+    def extractInfo(self, charInfo=1):
+        if self.cached_tables is None:
+            TTFontFace.extractInfo(self, charInfo)
+            return
+        TTFontFace.extractInfo(self, charInfo=0)
+        self.defaultWidth = self.cached_tables["defaultWidth"]
+        self.charToGlyph = dict(self.cached_tables["charToGlyph"])
+        self.charWidths = dict(self.cached_tables["charWidths"])
+        self.glyphToChar = dict(self.cached_tables["glyphToChar"])
+        self.hmetrics = self.cached_tables["hmetrics"]
+        self.glyphPos = self.cached_tables["glyphPos"]
+    
+    def makeSubset(self, subset):
+        key = hashlib.sha256(f"{self.digest}:{reportlab.Version}:{subset}".encode("ascii")).hexdigest()
+        data = FONT_SUBSETS.get(key)
+        if data is None:
+            cache_path = os.path.join(FONT_CACHE_DIR, f"subset-{key}.ttf")
+            if os.path.exists(cache_path):
+                with open(cache_path, 'rb') as f:
+                    data = f.read()
+            else:
+                with METRICS.timer("font_subset"):
+                    data = TTFontFace.makeSubset(self, subset)
+                try:
+                    os.makedirs(FONT_CACHE_DIR, exist_ok=True)
+                    with open(cache_path, 'wb') as f:
+                        f.write(data)
+                except OSError as e:
+                    print(f"Warnung: Schrift-Cache konnte nicht gespeichert werden: {str(e)}")
+            FONT_SUBSETS[key] = data
+        return data
+
+class CardFont(TTFont):
+    """A TTFont around a CardFontFace (TTFont.__init__ always parses the whole file).
+    
+    Sets the attributes TTFont.__init__ of the reportlab version pinned in
+    requirements.txt sets; tests/test_fonts.py renders a deck with it.
+    """
+    
+    def __init__(self, name, face):
+        self.fontName = name
+        self.face = face
+        self.encoding = TTEncoding()
+        self.state = WeakKeyDictionary()
+        self._asciiReadable = rl_config.ttfAsciiReadable
+        self.shapable = not any(fnmatch.fnmatch(name, pattern) for pattern in rl_config.unShapedFontGlob or ())
+
+def font_tables(face):
+    """The character tables of a parsed face as JSON data for the font cache."""
+    return {
+        "key": font_cache_key(),
+        "defaultWidth": face.defaultWidth,
+        "charToGlyph": list(face.charToGlyph.items()),
+        "charWidths": list(face.charWidths.items()),
+        "glyphToChar": list(face.glyphToChar.items()),
+        "hmetrics": face.hmetrics,
+        "glyphPos": face.glyphPos,
+    }
+
+def load_font_tables(cache_path):
+    """Return the cached character tables of a font, or None if there are none for this version."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            tables = json.load(f)
+        return tables if tables.get("key") == font_cache_key() else None
+    except Exception as e:
+        print(f"Fehler beim Laden des Schrift-Caches, Schrift wird neu gelesen: {str(e)}")
+        return None
+
+def load_ttf_font(font_name, path):
+    """Return a TrueType font file loaded as font_name, from memory or with its tables from the disk cache.
+    
+    The character tables are saved to FONT_CACHE_DIR as JSON after the first
+    parse (see CardFontFace). Raises ValueError if the file does not exist.
+    """
+    if (font_name, path) in TTF_FONTS:
+        return TTF_FONTS[(font_name, path)]
+    
+    with METRICS.timer("font"):
+        digest = file_digest(path)
+        if digest is None:
+            raise ValueError(f"Schriftdatei nicht gefunden: {path}")
+        cache_path = os.path.join(FONT_CACHE_DIR, f"{digest}.json")
+        tables = load_font_tables(cache_path)
+        if tables is None:
+            print(f"Lese Schrift: {path}")
+            face = CardFontFace(path, digest)
+            METRICS.count("font_parses")
+            try:
+                os.makedirs(FONT_CACHE_DIR, exist_ok=True)
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    json.dump(font_tables(face), f, separators=(",", ":"))
+            except OSError as e:
+                print(f"Warnung: Schrift-Cache konnte nicht gespeichert werden: {str(e)}")
+        else:
+            METRICS.count("font_hits")
+            face = CardFontFace(path, digest, tables)
+        font = CardFont(font_name, face)
+    
+    TTF_FONTS[(font_name, path)] = font
+    return font
+
+def set_card_fonts(regular_path, bold_path=None):
+    """Draw all card text in a TrueType font (and its bold cut) instead of Helvetica.
+    
+    The fonts are embedded as subsets, so the Bitcoin symbol and every other
+    character the font has are printed as they are. Without bold_path the
+    regular font is used for bold text too. Raises ValueError if a file is missing.
+    """
+    global QUESTION_FONT, OPTION_FONT, OPTION_ANSWER_FONT, DIFFICULTY_LABEL_FONT, CATEGORY_LABEL_FONT
+    global DECK_FONTS, CARD_FONT_FILES, NATIVE_BITCOIN_SYMBOL
+    
+    fonts = {CARD_FONT_NAME: load_ttf_font(CARD_FONT_NAME, regular_path)}
+    if bold_path:
+        fonts[CARD_BOLD_FONT_NAME] = load_ttf_font(CARD_BOLD_FONT_NAME, bold_path)
+    for font in fonts.values():
+        pdfmetrics.registerFont(font)
+    bold_name = CARD_BOLD_FONT_NAME if bold_path else CARD_FONT_NAME
+    if CARD_FONT_FILES != (regular_path, bold_path):
+        # Widths memoized under the same font names belong to other files
+        WIDTH_CACHE.clear()
+    
+    QUESTION_FONT = OPTION_ANSWER_FONT = DIFFICULTY_LABEL_FONT = bold_name
+    OPTION_FONT = CATEGORY_LABEL_FONT = CARD_FONT_NAME
+    DECK_FONTS = tuple(fonts)
+    CARD_FONT_FILES = (regular_path, bold_path)
+    NATIVE_BITCOIN_SYMBOL = all(ord("₿") in font.face.charToGlyph for font in fonts.values())
+
+def warm_caches():
+    """Load the logo and the font metrics of the card text up front, e.g. in a long-running worker process."""
+    load_logo_image()
+    characters = [chr(code) for code in range(32, 256)]
+    for font_name in DECK_FONTS:
+        for font_size in set(OPTION_FONT_SIZES + AUTO_FIT_OPTION_SIZES + AUTO_FIT_QUESTION_SIZES + (QUESTION_FONT_SIZE,)):
+            for character in characters:
+                text_width(character, font_name, font_size)
+
+def render_deck(questions=None, json_file=None, question_filter=None, auto_fit=False, imposition=DEFAULT_IMPOSITION):
+    """Library API: render a deck in memory and return (pdf_bytes, overflow_cards).
+    
+    The cards come from a list of question dicts, or from json_file, optionally
+    narrowed by a QuestionFilter, and are imposed with one IMPOSITION_PROFILES
+    entry. Unlike create_trivia_cards, nothing is written to disk, so it can
+    be called repeatedly in one process with warm caches. Raises ValueError if
+    no cards are selected, the profile is unknown or the deck exceeds MAX_BYTES_PER_CARD.
+    """
+    if imposition not in IMPOSITION_PROFILES:
+        raise ValueError(f"Unbekanntes Drucklayout: {imposition}")
+    if questions is None:
+        if json_file is None:
+            raise ValueError("Weder Fragen noch JSON-Datei angegeben")
+        if question_filter is not None:
+            questions = select_questions(json_file, question_filter)
+        elif is_bank_file(json_file):
+            with METRICS.timer("load"):
+                questions = QuestionBank(json_file)
+        else:
+            with METRICS.timer("load"):
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    questions = json.load(f)
+    
+    buffer = io.BytesIO()
+    card_count, overflow_cards = render_cards(questions, {imposition: buffer}, auto_fit)
+    if card_count == 0:
+        raise ValueError("Keine Fragen ausgewählt")
+    if not check_size_budget(buffer.tell(), card_count):
+        raise ValueError(f"PDF überschreitet das Budget von {MAX_BYTES_PER_CARD} Bytes pro Karte")
+    return buffer.getvalue(), overflow_cards
+
+def build_question_index(json_file):
+    """Scan a question file once and record the byte range, difficulty and category of every question."""
+    with open(json_file, 'rb') as f:
+        data = f.read()
+    text = data.decode('utf-8')
+    decoder = json.JSONDecoder()
+    separators = re.compile(r'[\s,]*')
+    
+    pos = separators.match(text).end()
+    if not text.startswith("[", pos):
+        raise ValueError(f"JSON-Datei enthält kein Array: {json_file}")
+    pos = separators.match(text, pos + 1).end()
+    
+    offsets = []
+    by_difficulty = {}
+    by_category = {}
+    char_pos, byte_pos = 0, 0  # Last position where characters and bytes are known to line up
+    while not text.startswith("]", pos):
+        question, end = decoder.raw_decode(text, pos)
+        start_byte = byte_pos + len(text[char_pos:pos].encode('utf-8'))
+        byte_pos = start_byte + len(text[pos:end].encode('utf-8'))
+        char_pos = end
+        
+        question_id = len(offsets)
+        offsets.append([start_byte, byte_pos])
+        difficulty = question.get("difficulty", "")
+        difficulty = DIFFICULTY_MAPPING.get(difficulty, difficulty).upper()
+        category = question.get("category", "")
+        category = CATEGORY_MAPPING.get(category, category)
+        by_difficulty.setdefault(difficulty, []).append(question_id)
+        by_category.setdefault(category, []).append(question_id)
+        pos = separators.match(text, end).end()
+    
+    return {
+        "version": INDEX_VERSION,
+        "digest": hashlib.sha256(data).hexdigest(),
+        "count": len(offsets),
+        "offsets": offsets,
+        "difficulty": by_difficulty,
+        "category": by_category,
+    }
+
+def index_cache_path(digest):
+    """Return the on-disk location of the question index for a file digest."""
+    return os.path.join(INDEX_CACHE_DIR, f"{digest}.json")
+
+def get_question_index(json_file):
+    """Return the question index of a file, from memory, the disk cache or a fresh scan."""
+    stat = os.stat(json_file)
+    key = (os.path.abspath(json_file), stat.st_mtime_ns, stat.st_size)
+    if key in QUESTION_INDEXES:
+        METRICS.count("index_hits")
+        return QUESTION_INDEXES[key]
+    
+    with METRICS.timer("index"):
+        digest = file_digest(json_file)
+        cache_path = index_cache_path(digest)
+        index = None
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                if index.get("version") != INDEX_VERSION or index.get("digest") != digest:
+                    index = None
+            except Exception as e:
+                print(f"Fehler beim Laden des Fragenindex, wird neu aufgebaut: {str(e)}")
+                index = None
+        
+        if index is None:
+            print(f"Erstelle Fragenindex für: {json_file}")
+            index = build_question_index(json_file)
+            METRICS.count("index_builds")
+            try:
+                os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    json.dump(index, f, separators=(",", ":"))
+            except OSError as e:
+                print(f"Warnung: Fragenindex konnte nicht gespeichert werden: {str(e)}")
+        else:
+            METRICS.count("index_hits")
+    
+    QUESTION_INDEXES[key] = index
+    return index
+
+def parse_question_ids(value):
+    """Parse an --ids value such as "3,5,10-20" into sorted, disjoint (first, last) ranges of 0-based positions.
+    
+    Ranges stay pairs until they are intersected with a file, so "0-100000000"
+    costs as little as "0-10". Raises ValueError for a part that is not a number.
+    """
+    ranges = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            first, last = int(first), int(last)
+        else:
+            first = last = int(part)
+        if first <= last:
+            ranges.append((first, last))
+    
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+def normalize_difficulty(name):
+    """Return the printed difficulty name (BITCOINER, CYPHERPUNK, SATOSHI) for a filter value."""
+    return name.strip().upper()
+
+def normalize_category(name):
+    """Return the English category for a filter value given in any language, or None if unknown."""
+    name = name.strip().casefold()
+    for category in list(CATEGORY_COLORS) + list(CATEGORY_MAPPING):
+        if category.casefold() == name:
+            return CATEGORY_MAPPING.get(category, category)
+    return None
+
+def select_question_ids(index, question_filter):
+    """Return the positions of the questions a filter selects, in file order."""
+    selected = set(range(index["count"]))
+    if question_filter.ids:
+        # (first, last) ranges, clamped to the file
+        wanted = set()
+        for first, last in question_filter.ids:
+            wanted.update(range(max(first, 0), min(last + 1, index["count"])))
+        selected &= wanted
+    if question_filter.difficulties:
+        wanted = set()
+        for difficulty in question_filter.difficulties:
+            wanted.update(index["difficulty"].get(normalize_difficulty(difficulty), []))
+        selected &= wanted
+    if question_filter.categories:
+        wanted = set()
+        for category in question_filter.categories:
+            wanted.update(index["category"].get(normalize_category(category), []))
+        selected &= wanted
+    
+    if question_filter.sample:
+        rng = random.Random(question_filter.seed)
+        if question_filter.per_category:
+            sampled = set()
+            for category in sorted(index["category"]):
+                candidates = sorted(selected.intersection(index["category"][category]))
+                sampled.update(rng.sample(candidates, min(question_filter.sample, len(candidates))))
+            selected = sampled
+        else:
+            candidates = sorted(selected)
+            selected = set(rng.sample(candidates, min(question_filter.sample, len(candidates))))
+    return sorted(selected)
+
+def iter_indexed_questions(json_file, index, question_ids):
+    """Yield the questions at the given positions, reading only their byte ranges from the file."""
+    with open(json_file, 'rb') as f:
+        for question_id in question_ids:
+            start, end = index["offsets"][question_id]
+            f.seek(start)
+            yield json.loads(f.read(end - start).decode('utf-8'))
+
+def bank_question_index(bank):
+    """Return the question index of a compiled bank (as build_question_index, without byte ranges)."""
+    index = {"count": len(bank), "difficulty": {}, "category": {}}
+    for difficulty, question_ids in bank.positions("difficulty").items():
+        index["difficulty"].setdefault(DIFFICULTY_MAPPING.get(difficulty, difficulty).upper(), []).extend(question_ids)
+    for category, question_ids in bank.positions("category").items():
+        index["category"].setdefault(CATEGORY_MAPPING.get(category, category), []).extend(question_ids)
+    return index
+
+def positioned_questions(json_file, question_filter=None):
+    """Return (question_ids, questions) of a JSON file or bank, narrowed by a QuestionFilter if one is given.
+    
+    question_ids are the 0-based positions in the file and questions yields
+    the matching questions lazily, in the same order.
+    """
+    if is_bank_file(json_file):
+        bank = QuestionBank(json_file)
+        if question_filter is None:
+            return range(len(bank)), iter(bank)
+        with METRICS.timer("index"):
+            index = bank_question_index(bank)
+        question_ids = select_question_ids(index, question_filter)
+        print(f"Auswahl: {len(question_ids)} von {index['count']} Fragen.")
+        return question_ids, (bank[question_id] for question_id in question_ids)
+    
+    if question_filter is None:
+        with METRICS.timer("load"):
+            with open(json_file, 'r', encoding='utf-8') as f:
+                questions = json.load(f)
+        return range(len(questions)), iter(questions)
+    index = get_question_index(json_file)
+    question_ids = select_question_ids(index, question_filter)
+    print(f"Auswahl: {len(question_ids)} von {index['count']} Fragen.")
+    return question_ids, iter_indexed_questions(json_file, index, question_ids)
+
+def select_questions(json_file, question_filter, stream=False):
+    """Return the questions of a file selected by a QuestionFilter (an iterator with stream=True)."""
+    _, questions = positioned_questions(json_file, question_filter)
+    if stream:
+        return questions
+    with METRICS.timer("load"):
+        return list(questions)
+
+
+def process_settings():
+    """Return the module settings set from the command line, to hand to worker processes."""
+    return {"LOG_PAGES": LOG_PAGES, "OPTIMIZE_OUTPUT": OPTIMIZE_OUTPUT, "MAX_BYTES_PER_CARD": MAX_BYTES_PER_CARD,
+            "IMPOSITIONS": IMPOSITIONS, "CARD_FONT_FILES": CARD_FONT_FILES, "REPRODUCIBLE": REPRODUCIBLE}
+
+def apply_process_settings(settings):
+    """Apply settings from process_settings() in a worker, which may not have been forked from the parent."""
+    globals().update(settings)
+    if CARD_FONT_FILES:
+        set_card_fonts(*CARD_FONT_FILES)
+
+def render_language(json_file, output_pdf, auto_fit, add_timestamp, stream, settings, question_filter=None,
+                    create_answers=False):
+    """Process pool entry point: render one language deck and return (success, pdf, metrics)."""
+    apply_process_settings(settings)
+    METRICS.reset()
+    success, result_pdf = create_trivia_cards(json_file, output_pdf, auto_fit, add_timestamp, stream,
+                                              question_filter=question_filter, create_answers=create_answers)
+    return success, result_pdf, METRICS.as_dict()
+
+
+def process_all_languages(create_answers=False, jobs=1, auto_fit=False, manifest_path=None, stream=False,
+                          question_filter=None):  # Default to no answer sheets
+    """Process all available language files, optionally in a process pool.
+    
+    With a manifest_path, only decks whose inputs changed are rebuilt (incremental mode).
+    A question_filter selects the same cards from every language. With
+    create_answers every deck gets an answer sheet.
+    """
+    json_files = find_json_files()
+    if not json_files:
+        print("Keine JSON-Dateien gefunden!")
+        print("Aktuelles Verzeichnis:", os.getcwd())
+        print("Verfügbare Dateien:")
+        for root, dirs, files in os.walk('.'):
+            for file in files:
+                if file.endswith('.json'):
+                    print(os.path.join(root, file))
+        return False
+    
+    print(f"Gefundene JSON-Dateien: {len(json_files)}")
+    
+    successful = 0
+    total = len(json_files)
+    manifest = load_build_manifest(manifest_path) if manifest_path else None
+    
+    # Vermeide doppelte Verarbeitung
+    processed_basenames = set()
+    tasks = []
+    
+    for json_file in json_files:
+        # Extrahiere Sprachcode aus Dateinamen (z.B. "en.json" -> "en")
+        basename = os.path.basename(json_file)
+        if basename in processed_basenames:
+            print(f"Überspringe doppelte Datei: {json_file}")
+            continue
+            
+        processed_basenames.add(basename)
+        lang_code = os.path.splitext(basename)[0]
+        output_pdf = f"bitcoin_trivia_cards_{lang_code}.pdf"
+        
+        target_pdf, entry = output_pdf, None
+        if manifest is not None:
+            up_to_date, target_pdf, entry = plan_incremental_build(manifest, json_file, output_pdf, auto_fit, stream,
+                                                                   question_filter, create_answers)
+            if up_to_date:
+                print(f"[{lang_code}] unverändert, überspringe: {entry['output']}")
+                successful += 1
+                continue
+        tasks.append((lang_code, json_file, output_pdf, target_pdf, entry))
+    
+    add_timestamp = manifest is None
+    
+    if jobs > 1 and len(tasks) > 1:
+        # Each language is independent CPU-bound ReportLab work, so render them in worker processes
+        workers = min(jobs, len(tasks))
+        print(f"Verarbeite {len(tasks)} Sprachen parallel mit {workers} Prozessen...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for task in tasks:
+                lang_code, json_file, output_pdf, target_pdf, entry = task
+                future = executor.submit(render_language, json_file, target_pdf, auto_fit, add_timestamp, stream,
+                                         process_settings(), question_filter, create_answers)
+                futures[future] = task
+            for future in as_completed(futures):
+                lang_code, json_file, output_pdf, target_pdf, entry = futures[future]
+                try:
+                    success, result_pdf, worker_metrics = future.result()
+                    METRICS.merge(worker_metrics)
+                except Exception as e:
+                    print(f"Fehler bei der Verarbeitung von {json_file}: {str(e)}")
+                    success, result_pdf = False, None
+                
+                if success:
+                    successful += 1
+                    if entry is not None:
+                        record_incremental_build(manifest, output_pdf, entry)
+                    print(f"[{lang_code}] erfolgreich: {result_pdf}")
+                else:
+                    print(f"[{lang_code}] fehlgeschlagen: {json_file}")
+    else:
+        for lang_code, json_file, output_pdf, target_pdf, entry in tasks:
+            print(f"\n=== Verarbeite Sprache: {lang_code} ===")
+            print(f"JSON-Datei: {json_file}")
+            print(f"Ausgabe-PDF: {target_pdf}")
+            
+            # Create the cards PDF
+            success, _ = create_trivia_cards(json_file, target_pdf, auto_fit, add_timestamp, stream,
+                                             question_filter=question_filter, create_answers=create_answers)
+            
+            if success:
+                successful += 1
+                if entry is not None:
+                    record_incremental_build(manifest, output_pdf, entry)
+    
+    if manifest is not None:
+        save_build_manifest(manifest, manifest_path)
+    
+    print(f"\n=== Zusammenfassung ===")
+    print(f"{successful} von {total} Sprachdateien erfolgreich verarbeitet.")
+    return successful > 0
+
+
+def write_metrics_json(path, total_sec):
+    """Write the collected build metrics as JSON."""
+    data = METRICS.as_dict()
+    data["total_sec"] = total_sec
+    data["bytes_per_card_budget"] = MAX_BYTES_PER_CARD
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    print(f"Metriken gespeichert: {path}")
+
+
+def question_filter_from_args(args):
+    """Build a QuestionFilter from the selection options, None if none is set, or False if one is invalid."""
+    if not (args.difficulty or args.category or args.ids or args.sample):
+        return None
+    
+    known_difficulties = set(DIFFICULTY_MAPPING.values())
+    for difficulty in args.difficulty or []:
+        if normalize_difficulty(difficulty) not in known_difficulties:
+            print(f"Fehler: Unbekannte Schwierigkeit '{difficulty}'. Verfügbar: {', '.join(sorted(known_difficulties))}")
+            return False
+    categories = []
+    for category in args.category or []:
+        if normalize_category(category) is None:
+            print(f"Fehler: Unbekannte Kategorie '{category}'. Verfügbar: {', '.join(CATEGORY_COLORS)}")
+            return False
+        categories.append(normalize_category(category))
+    try:
+        ids = parse_question_ids(args.ids) if args.ids else None
+    except ValueError:
+        print(f"Fehler: Ungültige --ids Angabe '{args.ids}' (Beispiel: 3,5,10-20)")
+        return False
+    
+    difficulties = sorted(normalize_difficulty(difficulty) for difficulty in args.difficulty or [])
+    return QuestionFilter(difficulties or None, sorted(categories) or None, ids, args.sample, args.seed,
+                          args.per_category)
+
+
+def main(args):
+    """Run the generator for the parsed command line arguments. Returns True if every requested deck was built."""
+    manifest_path = args.manifest if args.incremental else None
+    
+    question_filter = question_filter_from_args(args)
+    if question_filter is False:
+        return False
+    
+    # Überprüfe, ob das Logo existiert
+    if not os.path.exists(LOGO_PATH):
+        print(f"Warnung: Logo-Datei nicht gefunden unter: {LOGO_PATH}")
+        print("Aktuelles Verzeichnis:", os.getcwd())
+        print("Suche nach Bilddateien in tools-Ordner:")
+        if os.path.exists("tools"):
+            for file in os.listdir("tools"):
+                if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
+                    print(f"Gefundene Bilddatei: {file}")
+    else:
+        print(f"Logo gefunden: {LOGO_PATH}")
+    
+    # Standardmodus oder Einzelne JSON-Datei
+    if args.json:
+        # Einzelne JSON-Datei verarbeiten
+        print(f"Verarbeite einzelne JSON-Datei: {args.json}")
+        json_file = args.json
+        if not os.path.exists(json_file):
+            # Alternative Pfade prüfen
+            alt_paths = [
+                os.path.join("tools", "lang", os.path.basename(json_file)),
+                os.path.join("lang", os.path.basename(json_file)),
+                os.path.join("tools", os.path.basename(json_file)),
+                os.path.join("docs", "lang", os.path.basename(json_file)),
+                os.path.join("tools", "lang_copy", os.path.basename(json_file)),
+                os.path.join("lang_copy", os.path.basename(json_file)),
+                os.path.join("docs", "lang_copy", os.path.basename(json_file))
+            ]
+            
+            for alt_path in alt_paths:
+                if os.path.exists(alt_path):
+                    json_file = alt_path
+                    print(f"JSON-Datei gefunden unter alternativen Pfad: {json_file}")
+                    break
+            else:
+                print(f"Fehler: Die JSON-Datei '{args.json}' existiert nicht.")
+                print(f"Aktuelles Verzeichnis: {os.getcwd()}")
+                print(f"Verfügbare JSON-Dateien:")
+                for json_file in find_json_files():
+                    print(f"  {json_file}")
+                # Statt zu beenden, verarbeiten wir automatisch alle verfügbaren Dateien
+                print("\nVerarbeite stattdessen alle verfügbaren Sprachdateien...")
+                return process_all_languages(args.answers, args.jobs, args.auto_fit, manifest_path, args.stream,
+                                             question_filter)
+        
+        # Create the cards PDF for the specified file
+        if manifest_path:
+            success, _ = create_trivia_cards_incremental(json_file, args.output, args.auto_fit, manifest_path,
+                                                         args.stream, args.page_jobs, question_filter, args.answers)
+        else:
+            success, _ = create_trivia_cards(json_file, args.output, args.auto_fit, stream=args.stream,
+                                             page_jobs=args.page_jobs, question_filter=question_filter,
+                                             create_answers=args.answers)
+        
+        # KEINE weitere Verarbeitung anderer Dateien wenn eine Datei explizit angegeben wurde
+        # So vermeiden wir doppelte Verarbeitung der en.json
+        if not success:
+            if METRICS.counters.get("size_budget_exceeded") or METRICS.counters.get("empty_selections"):
+                # The file was read and rendered as asked, the other languages would not fix that
+                return False
+            print("\nFehler bei der Verarbeitung der angegebenen JSON-Datei. Verarbeite stattdessen alle verfügbaren Dateien...")
+            process_all_languages(args.answers, args.jobs, args.auto_fit, manifest_path, args.stream, question_filter)
+            return False
+        return True
+    else:
+        # Standardmodus: Alle Sprachdateien verarbeiten
+        print("Verarbeite alle verfügbaren Sprachdateien...")
+        return process_all_languages(args.answers, args.jobs, args.auto_fit, manifest_path, args.stream,
+                                     question_filter)
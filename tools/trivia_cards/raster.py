@@ -0,0 +1,257 @@
+"""
+Raster export: every card as its own PNG or WebP image, painted with Pillow
+from the same CardLayout and text runs that draw_card puts into the PDF.
+Text uses the Type 1 Helvetica outlines that ship with ReportLab (or the
+--font TrueType files), so line breaks computed with the PDF font metrics
+fit the image as well.
+
+Each language gets a directory with one image per card and a manifest of
+card content hashes; a run only re-renders cards whose hash is new, and
+moves the images of cards that changed position.
+"""
+
+import json
+import os
+import shutil
+import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib import colors
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFontFace
+
+from . import generator
+from .generator import METRICS
+
+# Bump when the raster drawing changes so cached images are rendered again
+RASTER_VERSION = 1
+
+DEFAULT_RASTER_DIR = os.path.join("docs", "assets", "images", "cards")
+DEFAULT_RASTER_DPI = 300
+RASTER_FORMATS = {"png": "PNG", "webp": "WEBP"}
+RASTER_MANIFEST = "manifest.json"
+
+# Encoder options per format (PNG optimize=True is about 3x slower for 5% smaller files)
+RASTER_SAVE_OPTIONS = {"png": {"compress_level": 6}, "webp": {"quality": 90}}
+
+# Cards per worker task
+RASTER_CHUNK_SIZE = 16
+
+# Card corner radius and line width in points (as drawn by get_chrome_form)
+CORNER_RADIUS = 5
+LINE_WIDTH = 1
+
+# Pillow fonts per (font name, pixel size) and the logo per pixel size
+RASTER_FONTS = {}
+RASTER_LOGOS = {}
+
+def raster_font(font_name, size_px):
+    """Return the Pillow font for a standard or TrueType PDF font at a pixel size."""
+    key = (font_name, size_px)
+    if key not in RASTER_FONTS:
+        face = pdfmetrics.getFont(font_name).face
+        path = face.filename if isinstance(face, TTFontFace) else face.findT1File()
+        RASTER_FONTS[key] = ImageFont.truetype(path, size_px)
+    return RASTER_FONTS[key]
+
+def raster_logo(size_px):
+    """Return the logo scaled to fit a square of size_px, or None if it is unavailable."""
+    if size_px not in RASTER_LOGOS:
+        logo = None
+        if os.path.exists(generator.LOGO_PATH):
+            with Image.open(generator.LOGO_PATH) as img:
+                logo = img.convert("RGBA")
+                logo.thumbnail((size_px, size_px), Image.LANCZOS)
+        RASTER_LOGOS[size_px] = logo
+    return RASTER_LOGOS[size_px]
+
+def pil_color(color):
+    """Convert a ReportLab color to an RGB tuple for Pillow."""
+    return tuple(int(round(component * 255)) for component in color.rgb())
+
+def paint_card(question_data, dpi=DEFAULT_RASTER_DPI, auto_fit=False):
+    """Paint one card as a Pillow image from its CardLayout."""
+    width = generator.CARD_WIDTH - generator.SPACING
+    height = generator.CARD_HEIGHT - generator.SPACING
+    scale = dpi / 72
+    layout = generator.layout_card(question_data, width, height, auto_fit)
+
+    def px(x, y):
+        # PDF points from the lower left corner to pixels from the upper left corner
+        return x * scale, (height - y) * scale
+
+    image = Image.new("RGB", (round(width * scale), round(height * scale)), "white")
+    draw = ImageDraw.Draw(image)
+    line_px = max(1, round(LINE_WIDTH * scale))
+
+    # Header, footer and border as in get_chrome_form
+    draw.rectangle([px(0, height), px(width, height - height / 10)], fill=pil_color(layout.difficulty_color))
+    draw.rectangle([px(0, height / 10), px(width, 0)], fill=pil_color(layout.category_color))
+    draw.rounded_rectangle([(0, 0), (image.width - 1, image.height - 1)], radius=CORNER_RADIUS * scale,
+                           outline=(0, 0, 0), width=line_px)
+
+    # Logo as in get_logo_form
+    box = round(generator.LOGO_SIZE * scale)
+    logo = raster_logo(box)
+    if logo is not None:
+        # Centred in its square box, like drawImage with preserveAspectRatio
+        left, top = px(width - generator.LOGO_SIZE - 5, height - 5)
+        image.paste(logo, (round(left) + (box - logo.width) // 2, round(top) + (box - logo.height) // 2), logo)
+
+    # Separator between question and options
+    y = layout.separator_y
+    draw.line([px(generator.QUESTION_PADDING, y), px(width - generator.QUESTION_PADDING, y)],
+              fill=pil_color(colors.lightgrey), width=line_px)
+
+    for run in generator.card_text_runs(layout, width, height):
+        font = raster_font(run.font_name, run.font_size * scale)
+        draw.text(px(run.x, run.y), run.text, font=font, fill=(0, 0, 0), anchor="ms" if run.centred else "ls")
+    return image
+
+def rasterize_cards(cards, fmt, dpi, auto_fit=False):
+    """Render (question, path) pairs to image files."""
+    for question_data, path in cards:
+        try:
+            with METRICS.timer("raster"):
+                image = paint_card(question_data, dpi, auto_fit)
+            with METRICS.timer("raster_save"):
+                image.save(path, RASTER_FORMATS[fmt], **RASTER_SAVE_OPTIONS[fmt])
+            METRICS.count("images_rendered")
+        except Exception as e:
+            print(f"Fehler beim Rendern des Kartenbilds {path}: {str(e)}")
+            METRICS.count("image_errors")
+
+def rasterize_cards_worker(cards, fmt, dpi, auto_fit=False, settings=None):
+    """Process pool entry point for rasterize_cards. Returns the worker's metrics.
+
+    settings comes from generator.process_settings() in the parent, so a worker
+    that was not forked paints in the same fonts.
+    """
+    if settings is not None:
+        generator.apply_process_settings(settings)
+    METRICS.reset()
+    rasterize_cards(cards, fmt, dpi, auto_fit)
+    return METRICS.as_dict()
+
+def card_hash(question_data, settings_digest):
+    """Content hash of a card image: the question and everything its drawing depends on."""
+    # dict() also turns a BankQuestion into a plain question
+    data = json.dumps({"question": dict(question_data), "settings": settings_digest},
+                      sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+def raster_settings_digest(fmt, dpi, auto_fit):
+    """Digest of the settings shared by all cards of an export."""
+    settings = {
+        "version": RASTER_VERSION,
+        "format": fmt,
+        "dpi": dpi,
+        "auto_fit": auto_fit,
+        "layout": generator.layout_settings(),
+        "logo": generator.file_digest(generator.LOGO_PATH),
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+def load_raster_manifest(path):
+    """Load the image manifest of a language directory, or return an empty one."""
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == RASTER_VERSION:
+                return manifest
+        except Exception as e:
+            print(f"Fehler beim Laden des Bild-Manifests: {str(e)}")
+    return {"version": RASTER_VERSION, "cards": {}}
+
+def reuse_images(image_dir, moves, sources, kept_cards):
+    """Move or copy existing images to the positions their cards moved to.
+
+    moves lists (digest, name) pairs, sources maps a digest to the image that
+    has it and kept_cards is the manifest after this run: a source it still
+    lists with the same digest is copied, any other is moved.
+    """
+    # Park the sources first, so no move overwrites an image that is still to be moved
+    parked = {}
+    for digest in {digest for digest, _ in moves}:
+        source = os.path.join(image_dir, sources[digest])
+        parked[digest] = f"{source}.{digest[:12]}.tmp"
+        if kept_cards.get(sources[digest]) == digest:
+            shutil.copyfile(source, parked[digest])
+        else:
+            os.replace(source, parked[digest])
+
+    remaining = Counter(digest for digest, _ in moves)
+    for digest, name in moves:
+        remaining[digest] -= 1
+        if remaining[digest]:
+            shutil.copyfile(parked[digest], os.path.join(image_dir, name))
+        else:
+            os.replace(parked[digest], os.path.join(image_dir, name))
+        METRICS.count("images_moved")
+
+def export_card_images(json_file, output_dir=DEFAULT_RASTER_DIR, fmt="png", dpi=DEFAULT_RASTER_DPI, jobs=1,
+                       auto_fit=False, question_filter=None):
+    """Write one image per card of a question file or bank to output_dir/<language>/. Returns True on success.
+
+    Images are named by the question's 0-based position in the file. Cards
+    whose content hash matches the manifest and whose image exists are skipped;
+    a card whose image exists under another position (after a question was
+    inserted or removed) gets that image moved or copied to its position.
+    """
+    lang_code = os.path.splitext(os.path.basename(json_file))[0]
+    image_dir = os.path.join(output_dir, lang_code)
+    os.makedirs(image_dir, exist_ok=True)
+    manifest_path = os.path.join(image_dir, RASTER_MANIFEST)
+    manifest = load_raster_manifest(manifest_path)
+
+    question_ids, questions = generator.positioned_questions(json_file, question_filter)
+
+    settings_digest = raster_settings_digest(fmt, dpi, auto_fit)
+    sources = {digest: name for name, digest in manifest["cards"].items()
+               if os.path.exists(os.path.join(image_dir, name))}
+    cards = {}
+    moves = []
+    pending = []
+    for question_id, question_data in zip(question_ids, questions):
+        name = f"{question_id:04d}.{fmt}"
+        digest = card_hash(question_data, settings_digest)
+        cards[name] = digest
+        path = os.path.join(image_dir, name)
+        if manifest["cards"].get(name) == digest and os.path.exists(path):
+            METRICS.count("images_cached")
+        elif digest in sources:
+            moves.append((digest, name))
+        else:
+            pending.append((question_data, path))
+
+    # A filtered run only updates the manifest entries of the selected cards
+    kept_cards = cards if question_filter is None else dict(manifest["cards"], **cards)
+    print(f"[{lang_code}] {len(cards)} Karten, {len(pending)} neu zu rendern, {len(moves)} verschoben, "
+          f"{len(cards) - len(pending) - len(moves)} unverändert")
+    # Before rendering, which may overwrite a source image
+    reuse_images(image_dir, moves, sources, kept_cards)
+    chunks = [pending[i:i + RASTER_CHUNK_SIZE] for i in range(0, len(pending), RASTER_CHUNK_SIZE)]
+    if jobs > 1 and len(chunks) > 1:
+        settings = generator.process_settings()
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(rasterize_cards_worker, chunk, fmt, dpi, auto_fit, settings) for chunk in chunks]
+            for future in as_completed(futures):
+                METRICS.merge(future.result())
+    else:
+        rasterize_cards(pending, fmt, dpi, auto_fit)
+
+    if question_filter is None:
+        # Images of questions that no longer exist are removed
+        for name in set(manifest["cards"]) - set(cards):
+            stale = os.path.join(image_dir, name)
+            if os.path.exists(stale):
+                os.remove(stale)
+    manifest["cards"] = kept_cards
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"[{lang_code}] Bilder gespeichert in: {image_dir}")
+    return True
@@ -0,0 +1,32 @@
+"""
+Question bank vocabulary shared by the renderer and the validator.
+Kept free of ReportLab so validation runs without loading the renderer.
+"""
+
+# Define mapping for difficulty levels (to rename them)
+DIFFICULTY_MAPPING = {
+    "curious": "BITCOINER",
+    "bitcoiner": "CYPHERPUNK",
+    "satoshi": "SATOSHI"
+}
+
+# Define German to English category mapping
+# This ensures that German categories use the same colors as their English counterparts
+CATEGORY_MAPPING = {
+    # German categories mapped to English equivalent
+    "Bitcoin Geschichte und Adoption": "Bitcoin History and Adoption",
+    "Technologie und Sicherheit": "Technology and Security",
+    "Proof of Work und Mining": "Proof of Work and Mining",
+    # Category names as used in docs/lang/de.json and docs/lang/fr.json
+    "Bitcoin-Geschichte und Adoption": "Bitcoin History and Adoption",
+    "Technik und Sicherheit": "Technology and Security",
+    "Histoire et adoption du Bitcoin": "Bitcoin History and Adoption",
+    "Technologie et sécurité": "Technology and Security",
+    "Proof of Work et minage": "Proof of Work and Mining"
+}
+
+# Letters printed before the options; a card has at most this many options
+OPTION_LETTERS = ["A", "B", "C", "D"]
+
+# Fields every question object must have
+QUESTION_FIELDS = ("question", "options", "answer", "difficulty", "category")
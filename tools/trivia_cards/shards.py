@@ -0,0 +1,100 @@
+"""
+Web quiz shards: docs/lang/*.json split into compact per-language, per-level
+files for docs/quiz.js, named by their content digest and listed in an index.
+Does not import ReportLab, so --validate can check that the shards are current.
+"""
+
+import json
+import os
+import glob
+import hashlib
+
+# Levels offered by the quiz (values of the "level" select in docs/index.html)
+QUIZ_LEVELS = ("curious", "bitcoiner", "satoshi")
+
+# Only the fields docs/quiz.js reads
+QUIZ_FIELDS = ("question", "options", "answer")
+
+LANG_DIR = os.path.join("docs", "lang")
+SHARD_DIR = os.path.join(LANG_DIR, "shards")
+INDEX_NAME = "index.json"
+
+def compact_json(data):
+    """Serialize data as minified UTF-8 JSON."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def level_shards(questions):
+    """Return {level: [questions]}, filtered like quiz.js does."""
+    shards = {}
+    for level in QUIZ_LEVELS:
+        # Same test as q.difficulty.includes(level) in quiz.js (substring or list membership)
+        shards[level] = [
+            {field: question[field] for field in QUIZ_FIELDS}
+            for question in questions
+            if level in question.get("difficulty", "")
+        ]
+    return shards
+
+def build_language_shards(json_file):
+    """Return {level: [questions]} for one language file."""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        return level_shards(json.load(f))
+
+def shard_file_name(lang_code, level, data):
+    """Content-addressed name of a shard: <lang>.<level>.<digest>.json."""
+    return f"{lang_code}.{level}.{hashlib.sha256(data).hexdigest()[:12]}.json"
+
+def build_quiz_shards(lang_dir=LANG_DIR, shard_dir=SHARD_DIR):
+    """Write content-addressed shard files plus an index manifest. Returns the index."""
+    os.makedirs(shard_dir, exist_ok=True)
+    index = {"levels": list(QUIZ_LEVELS), "languages": {}}
+    written = set()
+
+    for json_file in sorted(glob.glob(os.path.join(lang_dir, "*.json"))):
+        lang_code = os.path.splitext(os.path.basename(json_file))[0]
+        index["languages"][lang_code] = {}
+
+        for level, questions in build_language_shards(json_file).items():
+            data = compact_json(questions)
+            file_name = shard_file_name(lang_code, level, data)
+            path = os.path.join(shard_dir, file_name)
+            if not os.path.exists(path):
+                with open(path, 'wb') as f:
+                    f.write(data)
+            written.add(file_name)
+            index["languages"][lang_code][level] = {"file": file_name, "count": len(questions), "bytes": len(data)}
+            print(f"{lang_code}/{level}: {len(questions)} Fragen, {len(data)} Bytes -> {file_name}")
+
+    # Shard names change with their content, so older ones can be removed
+    for path in glob.glob(os.path.join(shard_dir, "*.json")):
+        file_name = os.path.basename(path)
+        if file_name != INDEX_NAME and file_name not in written:
+            print(f"Entferne veralteten Shard: {file_name}")
+            os.remove(path)
+
+    index["version"] = hashlib.sha256(compact_json(index["languages"])).hexdigest()[:12]
+    with open(os.path.join(shard_dir, INDEX_NAME), 'wb') as f:
+        f.write(compact_json(index))
+    return index
+
+def stale_shards(json_file, questions):
+    """Compare the shards of a language file with the index next to it (<dir>/shards/index.json).
+
+    Returns the levels whose indexed shard is missing or was built from other
+    questions, or None if the file has no shard index.
+    """
+    index_path = os.path.join(os.path.dirname(json_file), "shards", INDEX_NAME)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r', encoding='utf-8') as f:
+        indexed = json.load(f).get("languages", {})
+
+    lang_code = os.path.splitext(os.path.basename(json_file))[0]
+    stale = []
+    for level, shard in level_shards(questions).items():
+        file_name = shard_file_name(lang_code, level, compact_json(shard))
+        entry = indexed.get(lang_code, {}).get(level)
+        if (entry is None or entry.get("file") != file_name
+                or not os.path.exists(os.path.join(os.path.dirname(index_path), file_name))):
+            stale.append(level)
+    return stale
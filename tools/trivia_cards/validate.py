@@ -0,0 +1,237 @@
+"""
+Validation of question banks: schema checks per card, alignment of the
+language files by position, near-duplicate questions within a file and
+web quiz shards that were not rebuilt after the file changed.
+Does not import ReportLab, so it can run as a quick gate before rendering.
+"""
+
+import json
+import os
+import re
+import math
+import time
+import zlib
+from collections import Counter, namedtuple
+
+from .schema import CATEGORY_MAPPING, DIFFICULTY_MAPPING, OPTION_LETTERS, QUESTION_FIELDS
+from .shards import stale_shards
+
+# Language the other language files are compared against, if present
+REFERENCE_LANGUAGE = "en"
+
+# Near-duplicate detection: words per shingle and the Jaccard similarity of
+# two questions' shingle sets from which they are reported
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+# English category names (the targets of CATEGORY_MAPPING)
+ENGLISH_CATEGORIES = set(CATEGORY_MAPPING.values())
+
+# A finding: severity is "error" or "warning", index is the 0-based question position or None
+Issue = namedtuple("Issue", "severity file index message")
+
+def check_question(json_file, index, question):
+    """Return the schema issues of one question."""
+    issues = []
+
+    def error(message):
+        issues.append(Issue("error", json_file, index, message))
+
+    def warning(message):
+        issues.append(Issue("warning", json_file, index, message))
+
+    if not isinstance(question, dict):
+        error(f"ist kein Objekt, sondern {type(question).__name__}")
+        return issues
+
+    for field in QUESTION_FIELDS:
+        if field not in question:
+            error(f"Feld '{field}' fehlt")
+    for field in sorted(set(question) - set(QUESTION_FIELDS)):
+        warning(f"unbekanntes Feld '{field}'")
+
+    text = question.get("question")
+    if "question" in question and (not isinstance(text, str) or not text.strip()):
+        error("'question' ist leer oder kein Text")
+
+    options = question.get("options")
+    if "options" in question:
+        if not isinstance(options, list):
+            error("'options' ist keine Liste")
+            options = None
+        else:
+            if len(options) > len(OPTION_LETTERS):
+                error(f"{len(options)} Optionen, gedruckt werden nur {len(OPTION_LETTERS)}")
+            elif len(options) < 2:
+                error(f"nur {len(options)} Option(en)")
+            for i, option in enumerate(options):
+                if not isinstance(option, str) or not option.strip():
+                    error(f"Option {i} ist leer oder kein Text")
+            texts = [option.strip().casefold() for option in options if isinstance(option, str)]
+            if len(set(texts)) < len(texts):
+                warning("doppelte Optionen")
+
+    answer = question.get("answer")
+    if "answer" in question:
+        if not isinstance(answer, int) or isinstance(answer, bool):
+            error(f"'answer' ist keine Zahl: {answer!r}")
+        elif options is not None and not 0 <= answer < min(len(options), len(OPTION_LETTERS)):
+            error(f"'answer' {answer} liegt außerhalb der gedruckten Optionen (0-{min(len(options), len(OPTION_LETTERS)) - 1})")
+
+    difficulty = question.get("difficulty")
+    if "difficulty" in question and difficulty not in DIFFICULTY_MAPPING:
+        error(f"unbekannte Schwierigkeit {difficulty!r} (erlaubt: {', '.join(DIFFICULTY_MAPPING)})")
+
+    category = question.get("category")
+    if "category" in question and category not in CATEGORY_MAPPING and category not in ENGLISH_CATEGORIES:
+        error(f"Kategorie {category!r} hat keine Zuordnung in CATEGORY_MAPPING")
+
+    return issues
+
+def check_alignment(banks):
+    """Compare every language with the reference language position by position.
+
+    banks maps a language code to (json_file, questions). The same position
+    must have the same answer, difficulty, category and number of options.
+    """
+    issues = []
+    if len(banks) < 2:
+        return issues
+    reference = REFERENCE_LANGUAGE if REFERENCE_LANGUAGE in banks else sorted(banks)[0]
+    reference_file, reference_questions = banks[reference]
+
+    for lang_code in sorted(banks):
+        if lang_code == reference:
+            continue
+        json_file, questions = banks[lang_code]
+        if len(questions) != len(reference_questions):
+            issues.append(Issue("error", json_file, None,
+                                f"{len(questions)} Fragen, {reference} hat {len(reference_questions)}"))
+
+        for index, (question, expected) in enumerate(zip(questions, reference_questions)):
+            if not isinstance(question, dict) or not isinstance(expected, dict):
+                continue
+            for field in ("answer", "difficulty"):
+                if question.get(field) != expected.get(field):
+                    issues.append(Issue("error", json_file, index,
+                                        f"'{field}' ist {question.get(field)!r}, in {reference} {expected.get(field)!r}"))
+            category = CATEGORY_MAPPING.get(question.get("category"), question.get("category"))
+            expected_category = CATEGORY_MAPPING.get(expected.get("category"), expected.get("category"))
+            if category != expected_category:
+                issues.append(Issue("error", json_file, index,
+                                    f"Kategorie entspricht {category!r}, in {reference} {expected_category!r}"))
+            options, expected_options = question.get("options"), expected.get("options")
+            if isinstance(options, list) and isinstance(expected_options, list) and len(options) != len(expected_options):
+                issues.append(Issue("error", json_file, index,
+                                    f"{len(options)} Optionen, in {reference} {len(expected_options)}"))
+    return issues
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Return the hashed word shingles of a text (case and punctuation ignored)."""
+    words = re.findall(r"\w+", text.casefold())
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))}
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+def find_near_duplicates(texts, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """Return (i, j, similarity) for every text j that is a near-duplicate of an earlier text i.
+
+    Each j is reported once, against the first earlier text whose shingle set
+    has Jaccard similarity >= threshold with its own. Uses prefix filtering:
+    with the shingles of each text ordered from rarest to most common, two
+    sets this similar must share one of their first len - ceil(threshold * len) + 1
+    shingles, so only texts sharing such a rare shingle are compared instead of all pairs.
+    """
+    sets = [shingles(text) for text in texts]
+    frequency = Counter(shingle for shingle_set in sets for shingle in shingle_set)
+    inverted = {}
+    pairs = []
+
+    for i, shingle_set in enumerate(sets):
+        if not shingle_set:
+            continue
+        ordered = sorted(shingle_set, key=lambda shingle: (frequency[shingle], shingle))
+        prefix_length = len(ordered) - math.ceil(threshold * len(ordered)) + 1
+        candidates = set()
+        for shingle in ordered[:prefix_length]:
+            candidates.update(inverted.get(shingle, ()))
+            inverted.setdefault(shingle, []).append(i)
+
+        for j in sorted(candidates):
+            other = sets[j]
+            # Sets of very different size cannot reach the threshold
+            if min(len(other), len(shingle_set)) < threshold * max(len(other), len(shingle_set)):
+                continue
+            similarity = len(shingle_set & other) / len(shingle_set | other)
+            if similarity >= threshold:
+                pairs.append((j, i, similarity))
+                break
+    return pairs
+
+def check_duplicates(json_file, questions, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """Return warnings for near-duplicate questions within one file."""
+    positions = [index for index, question in enumerate(questions)
+                 if isinstance(question, dict) and isinstance(question.get("question"), str)]
+    texts = [questions[index]["question"] for index in positions]
+    issues = []
+    for i, j, similarity in find_near_duplicates(texts, threshold):
+        kind = "Duplikat" if similarity == 1.0 else f"fast gleich ({similarity:.0%})"
+        issues.append(Issue("warning", json_file, positions[j], f"{kind} wie Frage #{positions[i]}"))
+    return issues
+
+def check_shards(json_file, questions):
+    """Report quiz shards that no longer match the questions (see shards.stale_shards)."""
+    try:
+        stale = stale_shards(json_file, questions)
+    except (KeyError, TypeError, AttributeError):
+        return []   # Malformed questions are reported by check_question
+    except Exception as e:
+        return [Issue("error", json_file, None, f"Shard-Index kann nicht gelesen werden: {str(e)}")]
+    if not stale:
+        return []
+    return [Issue("error", json_file, None,
+                  f"Quiz-Shards veraltet ({', '.join(stale)}), bitte python tools/quiz-shards.py ausführen")]
+
+def validate_files(json_files, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """Validate question files in one pass. Returns the list of issues."""
+    issues = []
+    banks = {}
+    for json_file in json_files:
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                questions = json.load(f)
+        except Exception as e:
+            issues.append(Issue("error", json_file, None, f"kann nicht gelesen werden: {str(e)}"))
+            continue
+        if not isinstance(questions, list):
+            issues.append(Issue("error", json_file, None, "enthält kein Array"))
+            continue
+
+        for index, question in enumerate(questions):
+            issues.extend(check_question(json_file, index, question))
+        issues.extend(check_duplicates(json_file, questions, threshold))
+        issues.extend(check_shards(json_file, questions))
+        banks[os.path.splitext(os.path.basename(json_file))[0]] = (json_file, questions)
+
+    issues.extend(check_alignment(banks))
+    return issues
+
+def print_report(issues):
+    """Print the issues grouped by file. Returns the number of errors."""
+    errors = 0
+    for issue in sorted(issues, key=lambda issue: (issue.file, -1 if issue.index is None else issue.index)):
+        location = issue.file if issue.index is None else f"{issue.file} Frage #{issue.index}"
+        label = "FEHLER" if issue.severity == "error" else "Warnung"
+        print(f"{label}: {location}: {issue.message}")
+        errors += issue.severity == "error"
+    return errors
+
+def run_validation(json_files, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """Validate the files, print a report and return True if no errors were found."""
+    start = time.perf_counter()
+    issues = validate_files(json_files, threshold)
+    errors = print_report(issues)
+    warnings = len(issues) - errors
+    elapsed = time.perf_counter() - start
+    print(f"Validierung von {len(json_files)} Dateien: {errors} Fehler, {warnings} Warnungen ({elapsed * 1000:.0f} ms)")
+    return errors == 0
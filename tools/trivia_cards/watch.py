@@ -0,0 +1,165 @@
+"""
+Watch mode: keeps the drawn content of every card in memory, keyed by a hash
+of the question, and when a language file changes only draws the cards that
+are new or were edited. Pages (groups of CARDS_PER_PAGE cards) whose cards
+changed or moved are reassembled from the cached cards, and the PDF is then
+written from the cached page streams, the same way sharded rendering merges
+pages from workers.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import time
+import zlib
+from collections import namedtuple
+
+from reportlab.lib.rl_accel import fp_str
+from reportlab.pdfbase.pdfdoc import xObjectName
+from reportlab.pdfgen import canvas
+
+from . import generator
+
+# Seconds between checks of the watched files
+WATCH_INTERVAL = 0.3
+
+# Operators of a card drawn at the origin, the forms it uses, and its overflow report line
+RenderedCard = namedtuple("RenderedCard", ["content", "form_names", "overflow", "question"])
+
+def card_hash(question_data):
+    """Content hash of a question; cards are drawn again only when it changes."""
+    data = json.dumps(question_data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+class WatchedDeck:
+    """Drawn cards and assembled pages of one language file, kept between rebuilds."""
+
+    def __init__(self, json_file, output_pdf, auto_fit=False):
+        self.json_file = json_file
+        self.output_pdf = output_pdf
+        self.auto_fit = auto_fit
+        self.stat = None
+        self.cards = {}         # RenderedCard per card hash
+        self.pages = []         # Card hashes of each page as last assembled
+        self.rendered = []      # (compressed content, form names) of each page
+        self.form_specs = {}
+
+    def changed(self):
+        """Return True if the file changed since the last check."""
+        try:
+            stat = os.stat(self.json_file)
+        except OSError:
+            return False
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key == self.stat:
+            return False
+        self.stat = key
+        return True
+
+    def rebuild(self):
+        """Draw the new cards, reassemble the changed pages and write the PDF. Returns the number of drawn cards."""
+        start = time.perf_counter()
+        try:
+            with open(self.json_file, 'r', encoding='utf-8') as f:
+                questions = json.load(f)
+        except Exception as e:
+            # Editors save half-finished files; wait for the next change
+            print(f"Fehler beim Laden der JSON-Datei, warte auf die nächste Änderung: {str(e)}")
+            return 0
+
+        hashes = [card_hash(question_data) for question_data in questions]
+        new_cards = {digest: question_data for digest, question_data in zip(hashes, questions)
+                     if digest not in self.cards}
+        pages = [tuple(hashes[i:i + generator.CARDS_PER_PAGE])
+                 for i in range(0, len(hashes), generator.CARDS_PER_PAGE)]
+        changed = [number for number, page in enumerate(pages)
+                   if number >= len(self.pages) or self.pages[number] != page]
+        if not changed and len(pages) == len(self.pages):
+            return 0
+
+        with generator.pdf_output_settings():
+            self.draw_cards(new_cards)
+            for number in changed:
+                rendered_page = self.assemble_page(pages[number])
+                if number < len(self.rendered):
+                    self.rendered[number] = rendered_page
+                else:
+                    self.rendered.append(rendered_page)
+        del self.rendered[len(pages):]
+        self.pages = pages
+        # Cards that were edited or removed are not needed again
+        self.cards = {digest: self.cards[digest] for digest in hashes}
+
+        if self.rendered:
+            self.write_pdf()
+        elif os.path.exists(self.output_pdf):
+            # Not left behind with the cards of the last version that had questions
+            os.remove(self.output_pdf)
+            print(f"{self.json_file} enthält keine Fragen, {self.output_pdf} entfernt")
+        elapsed = time.perf_counter() - start
+        print(f"{self.output_pdf}: {len(new_cards)} Karten neu gezeichnet, {len(changed)} von {len(pages)} Seiten "
+              f"neu zusammengesetzt ({elapsed * 1000:.0f} ms)")
+        overflow_cards = [(number, self.cards[digest].question) for number, digest in enumerate(hashes, 1)
+                          if self.cards[digest].overflow]
+        generator.print_overflow_report(overflow_cards, self.auto_fit)
+        return len(new_cards)
+
+    def draw_cards(self, new_cards):
+        """Draw each new card at the origin of a scratch canvas and keep its operators."""
+        if not new_cards:
+            return
+        c = canvas.Canvas(io.BytesIO(), pagesize=generator.A4)
+        generator.register_deck_fonts(c)
+        width = generator.CARD_WIDTH - generator.SPACING
+        height = generator.CARD_HEIGHT - generator.SPACING
+        for digest, question_data in new_cards.items():
+            start = len(c._code)
+            layout = generator.draw_card(c, 0, 0, question_data, width, height, auto_fit=self.auto_fit)
+            content = "\n".join(c._code[start:])
+            # The forms a card stamps appear in its operators as "/<XObject name> Do"
+            form_names = {xObjectName(name): name for name in generator.FORM_SPECS}
+            used_forms = sorted(form_names[name] for name in re.findall(r"/(\S+) Do", content))
+            self.form_specs.update((name, generator.FORM_SPECS[name]) for name in used_forms)
+            self.cards[digest] = RenderedCard(content, used_forms, layout is not None and layout.overflow,
+                                              question_data.get("question", ""))
+            generator.METRICS.count("cards")
+
+    def assemble_page(self, page_hashes):
+        """Place the cached cards of a page in the default grid. Returns (compressed content, form names)."""
+        slots = generator.card_slots(generator.IMPOSITION_PROFILES[generator.DEFAULT_IMPOSITION])
+        parts = []
+        form_names = set()
+        for (x, y), digest in zip(slots, page_hashes):
+            card = self.cards[digest]
+            parts.append(f"q\n1 0 0 1 {fp_str(x, y)} cm\n{card.content}\nQ")
+            form_names.update(card.form_names)
+        content = "\n".join(parts).encode("utf-8")
+        return zlib.compress(content, generator.compression_level()), sorted(form_names)
+
+    def write_pdf(self):
+        """Assemble the cached pages into the output PDF, replacing it atomically."""
+        temp_pdf = f"{self.output_pdf}.tmp"
+        with generator.pdf_output_settings():
+            c = generator.deck_canvas(temp_pdf)
+            used_forms = {name for _, form_names in self.rendered for name in form_names}
+            for name in sorted(used_forms):
+                generator.build_form_from_spec(c, self.form_specs[name])
+            shared_resources = {}
+            for content, form_names in self.rendered:
+                generator.add_rendered_page(c, content, form_names, shared_resources)
+            c.save()
+        os.replace(temp_pdf, self.output_pdf)
+
+def watch(decks, interval=WATCH_INTERVAL):
+    """Rebuild decks whenever their file changes, until interrupted."""
+    print(f"Beobachte {len(decks)} Datei(en), Strg+C beendet den Watch-Modus.")
+    try:
+        while True:
+            for deck in decks:
+                if deck.changed():
+                    deck.rebuild()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Watch-Modus beendet.")